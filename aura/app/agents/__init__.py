@@ -1,20 +1,30 @@
 """Agents package for PolicyVoice."""
 
-from app.agents.agent import root_agent, PolicyVoiceOrchestrator
+from typing import Any
+
+from app.agents.agent import get_root_agent, Orchestrator
 from app.agents.guardrails_agent import create_guardrails_agent
-from app.agents.customer_context_agent import create_customer_context_agent, CustomerContextAgent
+from app.agents.customer_context_agent import create_customer_context_agent, ContextAgent
 from app.agents.rag_agent import create_rag_agent
 from app.agents.response_agent import create_response_agent
 from app.agents.write_agent import create_write_agent, WriteAgent
 
 __all__ = [
     "root_agent",
-    "PolicyVoiceOrchestrator",
+    "get_root_agent",
+    "Orchestrator",
     "create_guardrails_agent",
     "create_customer_context_agent",
-    "CustomerContextAgent",
+    "ContextAgent",
     "create_rag_agent",
     "create_response_agent",
     "create_write_agent",
     "WriteAgent",
-]
\ No newline at end of file
+]
+
+
+def __getattr__(name: str) -> Any:
+    # PEP 562: root_agent is only constructed when first accessed
+    if name == "root_agent":
+        return get_root_agent()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
\ No newline at end of file
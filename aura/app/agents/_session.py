@@ -0,0 +1,36 @@
+"""
+Session Snapshot - Read the session state keys an agent needs in one pass
+
+Agents used to probe ctx.session.state with a .get() per key, scattered
+through their code. snapshot() reads them once at the start of a run into
+an immutable namedtuple with the same defaults the agents used.
+"""
+
+from typing import NamedTuple
+
+from google.adk.agents.invocation_context import InvocationContext
+
+
+class SessionSnapshot(NamedTuple):
+    """Per-turn session values, read once."""
+    original_query: str
+    final_response: str
+    guardrails_result: dict  # Parsed once by the orchestrator
+    rag_answer: str
+    user_id: str
+    session_id: str
+    semantic_cache_hit: bool
+
+
+def snapshot(ctx: InvocationContext) -> SessionSnapshot:
+    """Read the per-turn session values from ctx in one pass."""
+    get = ctx.session.state.get
+    return SessionSnapshot(
+        original_query=get("original_query", ""),
+        final_response=get("final_response", ""),
+        guardrails_result=get("guardrails_result_obj") or {},
+        rag_answer=get("rag_answer", ""),
+        user_id=get("user_id", ""),
+        session_id=get("session_id", "unknown"),
+        semantic_cache_hit=get("semantic_cache_hit", False),
+    )
@@ -11,11 +11,12 @@ necessary, improving performance and maintainability. The orchestrator is
 responsible for routing, following the single responsibility principle.
 """
 
-import json
+import asyncio
 import logging
-from typing import AsyncGenerator, Union, Any
+from typing import AsyncGenerator, Union, Any, List, Optional
 from typing_extensions import override
 from pydantic import PrivateAttr
+import orjson
 
 from google.adk.agents import Agent, BaseAgent
 from google.adk.agents.invocation_context import InvocationContext
@@ -26,12 +27,33 @@ from app.agents.guardrails_agent import create_guardrails_agent
 from app.agents.customer_context_agent import create_customer_context_agent, CustomerContextAgent
 from app.agents.rag_agent import create_rag_agent
 from app.agents.response_agent import create_response_agent
-from app.agents.write_agent import create_write_agent, WriteAgent
+from app.agents.write_agent import create_write_agent, WriteAgent, _bg_tasks as _telemetry_tasks
 from app.utils.response_handler import ResponseHandler
 from app.utils.response_templates import ResponseTemplates
+from app.utils.redis_cache import get_cache, guardrails_cache_key
+from app.tools import semantic_cache
 
 logger = logging.getLogger(__name__)
 
+# Dialogflow CX session parameters copied into cx_parameters
+_CX_PARAM_KEYS = (
+    "customer_id",
+    "caller_name",
+    "phone_number",
+    "ani",
+    "dnis",
+)
+
+# Guardrails categories answered from templates, whatever the action says
+_SIMPLE_CATEGORIES = frozenset({"greeting", "thanks", "goodbye"})
+_BLOCK_CATEGORIES = frozenset({"out_of_scope", "security_risk"})
+_ESCALATE_CATEGORIES = frozenset({"complaint", "urgent_legal"})
+
+
+async def _drain(events: AsyncGenerator[Event, None]) -> List[Event]:
+    """Collect all events from a sub-agent run so it can execute as a task."""
+    return [event async for event in events]
+
 
 class Orchestrator(BaseAgent):
     """
@@ -44,6 +66,7 @@ class Orchestrator(BaseAgent):
         Guardrails → RAG → Response → Write
     
     The Write Agent runs at the end to save the conversation to long-term memory.
+    It is scheduled as a background task so it never delays the response.
     
     NOTE: CustomerContextAgent and WriteAgent are deterministic to avoid
     infinite tool-calling loops.
@@ -58,6 +81,7 @@ class Orchestrator(BaseAgent):
     _response: Any = PrivateAttr(default=None)
     _write: Any = PrivateAttr(default=None)
     _response_handler: Any = PrivateAttr(default=None)
+    _pending_writes: Any = PrivateAttr(default_factory=set)
 
     def __init__(
         self,
@@ -68,54 +92,94 @@ class Orchestrator(BaseAgent):
         response_agent: Agent = None,
         write_agent: BaseAgent = None,
     ):
-        """Initialize orchestrator with all agents including the write agent."""
-        # Create agents BEFORE calling super().__init__
-        _guardrails = guardrails_agent or create_guardrails_agent()
-        _customer_context = customer_context_agent or create_customer_context_agent()
-        _rag = rag_agent or create_rag_agent()
-        _response = response_agent or create_response_agent()
-        _write = write_agent or create_write_agent()
+        """
+        Initialize orchestrator with all agents including the write agent.
 
-        # Create sub_agents list for BaseAgent
-        sub_agents_list = [_guardrails, _customer_context, _rag, _response, _write]
+        Agents not passed in are built lazily on first use, so e.g. guest
+        turns never pay the Customer Context construction cost.
+        """
+        provided_agents = [
+            agent for agent in (
+                guardrails_agent,
+                customer_context_agent,
+                rag_agent,
+                response_agent,
+                write_agent,
+            )
+            if agent is not None
+        ]
 
         # Initialize BaseAgent
         super().__init__(
             name=name,
-            sub_agents=sub_agents_list,
+            sub_agents=provided_agents,
         )
         
         # Now set private attributes AFTER super().__init__
-        self._guardrails = _guardrails
-        self._customer_context = _customer_context
-        self._rag = _rag
-        self._response = _response
-        self._write = _write
+        self._guardrails = guardrails_agent
+        self._customer_context = customer_context_agent
+        self._rag = rag_agent
+        self._response = response_agent
+        self._write = write_agent
         self._response_handler = ResponseHandler(agent_name=name)
+        self._pending_writes = set()
 
         logger.info(f"Orchestrator initialized with deterministic agents")
+
+    def _build_sub_agent(self, factory) -> BaseAgent:
+        """Create a sub-agent on demand and attach it to the agent tree."""
+        agent = factory()
+        # Assigning parent_agent bypasses ADK's one-parent check - do it here
+        if agent.parent_agent is not None and agent.parent_agent is not self:
+            raise ValueError(
+                f"Agent '{agent.name}' already has a parent agent "
+                f"'{agent.parent_agent.name}', cannot add it to '{self.name}'"
+            )
+        agent.parent_agent = self
+        self.sub_agents.append(agent)
+        return agent
     
     # Properties to access agents (avoids Pydantic field serialization issues)
     @property
     def guardrails_agent(self):
+        if self._guardrails is None:
+            self._guardrails = self._build_sub_agent(create_guardrails_agent)
         return self._guardrails
     
     @property
     def customer_context_agent(self):
+        if self._customer_context is None:
+            self._customer_context = self._build_sub_agent(create_customer_context_agent)
         return self._customer_context
     
     @property
     def rag_agent(self):
+        if self._rag is None:
+            self._rag = self._build_sub_agent(create_rag_agent)
         return self._rag
     
     @property
     def response_agent(self):
+        if self._response is None:
+            self._response = self._build_sub_agent(create_response_agent)
         return self._response
     
     @property
     def write_agent(self):
+        if self._write is None:
+            self._write = self._build_sub_agent(create_write_agent)
         return self._write
     
+    def warm(self) -> None:
+        """Build every sub-agent now instead of on first use."""
+        _ = (
+            self.guardrails_agent,
+            self.customer_context_agent,
+            self.rag_agent,
+            self.response_agent,
+            self.write_agent,
+        )
+    
     @property
     def response_handler(self):
         return self._response_handler
@@ -139,33 +203,56 @@ class Orchestrator(BaseAgent):
         ctx.session.state["original_query"] = original_query
         logger.info(f"[{self.name}] Query: {original_query[:100]}...")
 
-        # Run Guardrails Agent
-        logger.info(f"[{self.name}] → Running Guardrails Agent")
-        async for event in self.guardrails_agent.run_async(ctx):
-            yield event
+        # Run Guardrails Agent, unless this query was classified recently
+        cache = get_cache()
+        guardrails_key = guardrails_cache_key(
+            original_query,
+            ctx.session.id,
+            ctx.session.state.get("customer_id"),
+            ctx.session.state.get("user_id"),
+            ctx.session.state.get("caller_name"),
+        )
+        cached_guardrails = await cache.get(guardrails_key)
 
+        if cached_guardrails:
+            logger.info(f"[{self.name}] Guardrails cache hit - skipping agent")
+            ctx.session.state["guardrails_result"] = cached_guardrails
+        else:
+            logger.info(f"[{self.name}] → Running Guardrails Agent")
+            async for event in self.guardrails_agent.run_async(ctx):
+                yield event
+
+        # Parse exactly once per turn - downstream agents read the parsed
+        # dict (guardrails_result_obj) or the canonical JSON string
         guardrails_result = self._parse_guardrails_result(ctx)
+        ctx.session.state["guardrails_result_obj"] = guardrails_result
+        ctx.session.state["guardrails_result"] = orjson.dumps(guardrails_result).decode()
         action = guardrails_result.get("action", "allow")
         category = guardrails_result.get("category", "other")
         is_authenticated = guardrails_result.get("is_authenticated", False)
 
+        # Only cache allowed results to avoid sticky false blocks/escalations
+        if not cached_guardrails and action == "allow":
+            await cache.setex(guardrails_key, settings.GUARDRAILS_CACHE_TTL, guardrails_result)
+
         logger.info(
             f"[{self.name}] Guardrails: action={action}, category={category}, "
             f"authenticated={is_authenticated}"
         )
 
-        # Route based on guardrails
-        if action == "block":
+        # Route based on guardrails - categories that never need retrieval
+        # are answered from templates without running RAG/Response
+        if action == "block" or category in _BLOCK_CATEGORIES:
             async for event in self._handle_blocked_route(ctx, category, guardrails_result):
                 yield event
             return
 
-        if action == "escalate":
+        if action == "escalate" or category in _ESCALATE_CATEGORIES:
             async for event in self._handle_escalation(ctx, category, guardrails_result):
                 yield event
             return
 
-        if category in ["greeting", "thanks", "goodbye"]:
+        if category in _SIMPLE_CATEGORIES:
             async for event in self._handle_simple_response(ctx, category):
                 yield event
             return
@@ -199,23 +286,40 @@ class Orchestrator(BaseAgent):
             f"id={customer_id}, name={caller_name}"
         )
 
+        if not customer_id:
+            # Nothing to look up - skip the Customer Context agent entirely
+            logger.info(
+                f"[{self.name}] No customer_id available. Using guest flow."
+            )
+            async for event in self._guest_flow(ctx):
+                yield event
+            return
+
         # Store for customer context agent to use
         ctx.session.state["customer_id"] = customer_id
         ctx.session.state["caller_name"] = caller_name
 
-        # Run Customer Context Agent
-        logger.info(f"[{self.name}] → Running Customer Context Agent")
-        async for event in self.customer_context_agent.run_async(ctx):
+        cached_answer = await self._lookup_cached_answer(ctx)
+
+        if cached_answer:
+            # Reuse the cached RAG answer - the response is still personalized
+            logger.info(f"[{self.name}] → Running Customer Context Agent (RAG answer cached)")
+            ctx.session.state["rag_answer"] = cached_answer["rag_answer"]
+            context_events = await _drain(self.customer_context_agent.run_async(ctx))
+            rag_events = []
+        else:
+            # Run Customer Context and RAG concurrently - RAG only needs the
+            # query, and both agents write to disjoint session state keys
+            logger.info(f"[{self.name}] → Running Customer Context + RAG Agents (concurrent)")
+            context_events, rag_events = await asyncio.gather(
+                _drain(self.customer_context_agent.run_async(ctx)),
+                _drain(self.rag_agent.run_async(ctx)),
+            )
+        for event in context_events:
             yield event
 
-        customer_context = ctx.session.state.get("customer_context", {})
-        
-        if isinstance(customer_context, str):
-            try:
-                import json
-                customer_context = json.loads(customer_context)
-            except:
-                customer_context = {}
+        # Already-parsed copy stored by the context agent - no JSON round-trip
+        customer_context = ctx.session.state.get("customer_context_obj") or {}
         
         customer_found = customer_context.get("customer_found", False)
 
@@ -223,8 +327,8 @@ class Orchestrator(BaseAgent):
             logger.warning(
                 f"[{self.name}] Customer not found. Falling back to guest flow."
             )
-            # Fall back to guest flow if lookup fails
-            async for event in self._guest_flow(ctx):
+            # Fall back to guest flow if lookup fails (RAG already ran)
+            async for event in self._guest_flow(ctx, rag_events=rag_events):
                 yield event
             return
 
@@ -236,9 +340,7 @@ class Orchestrator(BaseAgent):
             f"has_history={has_history}"
         )
 
-        # Run RAG Agent
-        logger.info(f"[{self.name}] → Running RAG Agent")
-        async for event in self.rag_agent.run_async(ctx):
+        for event in rag_events:
             yield event
 
         # Run Response Agent (with personalization)
@@ -247,21 +349,23 @@ class Orchestrator(BaseAgent):
         async for event in self.response_agent.run_async(ctx):
             yield event
 
-        # Run Write Agent (save to long-term memory)
-        logger.info(f"[{self.name}] → Running Write Agent (save conversation)")
-        async for event in self.write_agent.run_async(ctx):
-            # Write agent events are internal, don't yield to user
-            pass
+        # Run Write Agent (save to long-term memory) off the response path
+        logger.info(f"[{self.name}] → Scheduling Write Agent (save conversation)")
+        self._schedule_write(ctx)
 
         logger.info(f"[{self.name}] Authenticated flow complete")
 
     async def _guest_flow(
         self,
-        ctx: InvocationContext
+        ctx: InvocationContext,
+        rag_events: Optional[List[Event]] = None
     ) -> AsyncGenerator[Event, None]:
         """
         Guest user flow.
         Steps: RAG -> Generic Response -> Write
+
+        If rag_events is given, RAG has already run (authenticated fallback)
+        and its buffered events are replayed instead of running it again.
         """
 
         logger.info(f"[{self.name}] Guest user - no customer context needed")
@@ -274,42 +378,137 @@ class Orchestrator(BaseAgent):
             "summary": "Guest user - provide generic information"
         }
 
-        # Run RAG Agent
-        logger.info(f"[{self.name}] → Running RAG Agent")
-        async for event in self.rag_agent.run_async(ctx):
-            yield event
+        cached_answer = None
+        if rag_events is None:
+            cached_answer = await self._lookup_cached_answer(ctx)
 
-        # Run Response Agent (generic, no personalization)
-        logger.info(f"[{self.name}] → Running Response Agent (Generic)")
-        ctx.session.state["personalize"] = False
-        async for event in self.response_agent.run_async(ctx):
-            yield event
+        if cached_answer:
+            # Generic answers are safe to reuse as-is - skip RAG and Response
+            logger.info(f"[{self.name}] → Serving cached answer")
+            async for event in self._serve_cached_answer(ctx, cached_answer):
+                yield event
+        else:
+            # Run RAG Agent
+            if rag_events is None:
+                logger.info(f"[{self.name}] → Running RAG Agent")
+                async for event in self.rag_agent.run_async(ctx):
+                    yield event
+            else:
+                for event in rag_events:
+                    yield event
+
+            # Run Response Agent (generic, no personalization)
+            logger.info(f"[{self.name}] → Running Response Agent (Generic)")
+            ctx.session.state["personalize"] = False
+            async for event in self.response_agent.run_async(ctx):
+                yield event
+
+            # RAG for authenticated callers saw their identity - only cache
+            # answers produced for anonymous guests
+            if rag_events is None and not ctx.session.state["guardrails_result_obj"].get("is_authenticated"):
+                self._schedule_cache_store(ctx)
 
-        # Run Write Agent (for analytics)
-        logger.info(f"[{self.name}] → Running Write Agent (telemetry only)")
-        async for event in self.write_agent.run_async(ctx):
-            pass  # Internal, don't yield
+        # Run Write Agent (for analytics) off the response path
+        logger.info(f"[{self.name}] → Scheduling Write Agent (telemetry only)")
+        self._schedule_write(ctx)
 
         logger.info(f"[{self.name}] Guest flow complete")
 
-    def _extract_cx_parameters(self, ctx: InvocationContext) -> dict:
-        """Extract customer parameters from Dialogflow CX session"""
-        cx_params = {}
+    def _schedule_write(self, ctx: InvocationContext) -> None:
+        """
+        Run the Write Agent as a background task.
+
+        The session state is snapshotted first so that later turns mutating
+        the live session cannot race with the background write.
+        """
+        snapshot_session = ctx.session.model_copy(
+            update={"state": dict(ctx.session.state)}
+        )
+        write_ctx = ctx.model_copy(update={"session": snapshot_session})
+
+        task = asyncio.create_task(self._drain_write(write_ctx))
+        # Keep a reference so the task isn't garbage collected mid-flight
+        self._pending_writes.add(task)
+        task.add_done_callback(self._pending_writes.discard)
+
+    async def _lookup_cached_answer(self, ctx: InvocationContext) -> Optional[dict]:
+        """Look up a semantically cached answer for the current query."""
+        if not semantic_cache.is_enabled():
+            return None
+
+        category = ctx.session.state["guardrails_result_obj"].get("category", "other")
+        cached_answer = await asyncio.to_thread(
+            semantic_cache.lookup,
+            ctx.session.state.get("original_query", ""),
+            category,
+        )
+        # Recorded with the turn's telemetry
+        ctx.session.state["semantic_cache_hit"] = cached_answer is not None
+        return cached_answer
+
+    async def _serve_cached_answer(
+        self, ctx: InvocationContext, cached_answer: dict
+    ) -> AsyncGenerator[Event, None]:
+        """Yield a cached generic answer in place of the RAG + Response agents."""
+        final_response = cached_answer["final_response"]
+        try:
+            speech_text = orjson.loads(final_response).get("speech_text", final_response)
+        except (orjson.JSONDecodeError, AttributeError):
+            speech_text = final_response
+
+        yield self.response_handler.create_event(
+            message=speech_text,
+            metadata={"action": "cached_response", "category": "semantic_cache"}
+        )
+
+        ctx.session.state["rag_answer"] = cached_answer["rag_answer"]
+        ctx.session.state["final_response"] = final_response
+
+    def _schedule_cache_store(self, ctx: InvocationContext) -> None:
+        """Store this turn's generic answer in the semantic cache in the background."""
+        if not semantic_cache.is_enabled():
+            return
+
         state = ctx.session.state
+        task = asyncio.create_task(asyncio.to_thread(
+            semantic_cache.store,
+            state.get("original_query", ""),
+            ctx.session.state["guardrails_result_obj"].get("category", "other"),
+            str(state.get("rag_answer", "")),
+            str(state.get("final_response", "")),
+        ))
+        self._pending_writes.add(task)
+        task.add_done_callback(self._pending_writes.discard)
+
+    async def drain_pending_writes(self, timeout: float = 10.0) -> None:
+        """
+        Wait up to timeout seconds for background writes - call on shutdown,
+        before stopping the telemetry batcher.
+        """
+        async def drain() -> None:
+            # Write agents can start direct telemetry tasks - wait for those after
+            for tasks in (self._pending_writes, _telemetry_tasks):
+                if tasks:
+                    await asyncio.gather(*list(tasks), return_exceptions=True)
 
-        param_keys = [
-            "customer_id",
-            "caller_name",
-            "phone_number",
-            "ani",
-            "dnis"
-        ]
+        try:
+            await asyncio.wait_for(drain(), timeout)
+        except asyncio.TimeoutError:
+            logger.warning(
+                f"[{self.name}] Background writes still running after {timeout}s - abandoning them"
+            )
 
-        for key in param_keys:
-            if key in state and state[key]:
-                cx_params[key] = state[key]
+    async def _drain_write(self, ctx: InvocationContext) -> None:
+        """Drive the Write Agent to completion, logging any failure."""
+        try:
+            await self.write_agent.run_and_discard(ctx)
+        except Exception as e:
+            logger.error(f"[{self.name}] Background write failed: {e}", exc_info=True)
 
-        return cx_params
+    def _extract_cx_parameters(self, ctx: InvocationContext) -> dict:
+        """Extract customer parameters from Dialogflow CX session"""
+        state = ctx.session.state
+        return {key: value for key in _CX_PARAM_KEYS if (value := state.get(key))}
 
     async def _handle_blocked_route(
         self, ctx: InvocationContext, category: str, guardrails_result: dict
@@ -380,12 +579,11 @@ class Orchestrator(BaseAgent):
 
     def _extract_user_query(self, ctx: InvocationContext) -> str:
         """Extract user query from context"""
-        try:
-            if ctx.user_content and ctx.user_content.parts:
-                return ctx.user_content.parts[0].text or ""
-        except Exception as e:
-            logger.warning(f"Could not extract user query: {e}")
-        return ""
+        user_content = getattr(ctx, "user_content", None)
+        parts = getattr(user_content, "parts", None)
+        if not parts:
+            return ""
+        return getattr(parts[0], "text", None) or ""
 
     def _parse_guardrails_result(self, ctx: InvocationContext) -> dict:
         """Parse guardrails result from session state"""
@@ -394,9 +592,9 @@ class Orchestrator(BaseAgent):
         try:
             if isinstance(raw_result, dict):
                 return raw_result
-            result = json.loads(str(raw_result))
+            result = orjson.loads(str(raw_result))
             return result
-        except json.JSONDecodeError as e:
+        except orjson.JSONDecodeError as e:
             logger.error(f"Failed to parse guardrails result: {e}")
             return {
                 "action": "escalate",
@@ -405,5 +603,20 @@ class Orchestrator(BaseAgent):
             }
 
 
-# Create the root_agent instance
-root_agent = Orchestrator()
\ No newline at end of file
+# Lazily-created root agent - built on first request, not at import time
+_root_agent: Optional[Orchestrator] = None
+
+
+def get_root_agent() -> Orchestrator:
+    """Get the root agent, creating it on first use."""
+    global _root_agent
+    if _root_agent is None:
+        _root_agent = Orchestrator()
+    return _root_agent
+
+
+def __getattr__(name: str) -> Any:
+    # PEP 562: keep `from app.agents.agent import root_agent` working lazily
+    if name == "root_agent":
+        return get_root_agent()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
\ No newline at end of file
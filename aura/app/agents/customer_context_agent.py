@@ -8,33 +8,58 @@ Fetches:
 1. User data from a database
 2. User tier limits from a database
 3. Long-term conversation history
+
+User data and tier limits are near-static, so they are served from the
+Redis hot cache when one is configured (see app.utils.redis_cache).
 """
 
 import asyncio
 import json
 import logging
+import random
 from pathlib import Path
-from typing import Optional, List, AsyncGenerator
+from typing import Optional, List, AsyncGenerator, Tuple
 from typing_extensions import override
 
+import orjson
 from google.adk.agents import BaseAgent
 from google.adk.agents.invocation_context import InvocationContext
 from google.adk.events import Event, EventActions
-from pydantic import BaseModel
+from pydantic import BaseModel, ConfigDict, Field
 
 from app.config import settings
-from app.tools.fetch_customer import fetch_customer
-from app.tools.fetch_limits import fetch_limits
-from app.tools.conversation_memory import fetch_conversation_history
+from app.tools.fetch_customer import fetch_user_async
+from app.tools.fetch_limits import fetch_limits_async
+from app.tools.conversation_memory import fetch_conversation_history_async
+from app.utils.redis_cache import get_cache, customer_cache_key, limits_cache_key
 
 logger = logging.getLogger(__name__)
 
 # Maximum retries for GCP operations
 MAX_RETRIES = 2
 
+# Per-attempt timeout (seconds) so a hung GCP call can't stall the agent
+BACKEND_TIMEOUT = 2.0
+
+
+def _backoff_delay(attempt: int) -> float:
+    """Exponential backoff with jitter so concurrent sessions don't retry in lockstep."""
+    return min(2 ** attempt * 0.2, 1.0) + random.uniform(0, 0.2)
+
+
+def _safe_int(value, default: int = 0) -> int:
+    """Coerce a possibly missing or non-numeric value to int."""
+    try:
+        return int(value) if value else default
+    except (TypeError, ValueError):
+        return default
+
 
 class ContextResult(BaseModel):
     """Output schema for user context with conversation history"""
+    # Built once per turn then serialized - never mutated
+    model_config = ConfigDict(frozen=True, extra="forbid")
+    
     # User found status
     user_found: bool
     
@@ -48,7 +73,7 @@ class ContextResult(BaseModel):
     item_2_sum: Optional[int] = None
     standard_excess: Optional[int] = None
     extra_excess: Optional[int] = None
-    add_ons: Optional[List[str]] = None
+    add_ons: List[str] = Field(default_factory=list)
     special_conditions: Optional[str] = None
     tier_limits: Optional[dict] = None
     
@@ -57,7 +82,7 @@ class ContextResult(BaseModel):
     total_previous_calls: int = 0
     last_topic: Optional[str] = None
     last_interaction_date: Optional[str] = None
-    unresolved_issues: Optional[List[str]] = None
+    unresolved_issues: List[str] = Field(default_factory=list)
     sentiment_trend: Optional[str] = None
     conversation_summary: Optional[str] = None
     
@@ -89,93 +114,54 @@ class ContextAgent(BaseAgent):
             # Get identifiers from session state
             user_id = ctx.session.state.get("user_id", "")
             
-            # Initialize result
-            result = ContextResult(
-                user_found=False,
-                summary="Unable to fetch user context"
-            )
-            
             # ============================================================
             # STEP 1: Fetch User Profile with validation
             # ============================================================
-            user_data = None
-            for attempt in range(MAX_RETRIES):
-                try:
-                    if user_id:
-                        user_result = fetch_customer(
-                            project_id=settings.GCP_PROJECT_ID,
-                            customer_id=user_id
-                        )
-                    else:
-                        logger.warning(f"[{self.name}] No user_id provided")
-                        break
-                    
-                    if user_result and isinstance(user_result, dict) and user_result.get("success"):
-                        user_data = user_result.get("customer", {})
-                        user_id = user_result.get("customer_id") or user_id
-                        # Update session state with resolved user_id
-                        ctx.session.state["user_id"] = user_id
-                        logger.info(f"[{self.name}] User found: {user_data.get('name')}")
-                        break
-                    else:
-                        error_msg = user_result.get("error", "Unknown error") if isinstance(user_result, dict) else "Invalid result type"
-                        logger.warning(f"[{self.name}] User lookup failed: {error_msg}")
-                except Exception as e:
-                    logger.warning(f"[{self.name}] User fetch attempt {attempt+1}/{MAX_RETRIES} failed: {e}")
-                    if attempt < MAX_RETRIES - 1:
-                        await asyncio.sleep(0.5 * (attempt + 1))
+            if not user_id:
+                logger.warning(f"[{self.name}] No user_id provided")
+                user_data = None
+            else:
+                user_data, user_id = await self._fetch_user(user_id)
             
             if not user_data:
                 # Return early if no user found
-                result.summary = "User not found in database"
-                self._safe_store_result(ctx, result)
+                result = ContextResult(
+                    user_found=False,
+                    summary="User not found in database"
+                )
+                payload = self._safe_store_result(ctx, result)
                 yield Event(
                     author=self.name,
-                    actions=EventActions(state_delta={"customer_context": ctx.session.state.get("customer_context")})
+                    actions=EventActions(state_delta={"customer_context": payload})
                 )
                 return
             
+            # Update session state with resolved user_id
+            ctx.session.state["user_id"] = user_id
+            
             # ============================================================
-            # STEP 2: Fetch Tier Limits with validation
+            # STEP 2 + 3: Fetch Tier Limits and Conversation History
+            # concurrently - they only depend on the user profile
             # ============================================================
-            tier_limits = None
             user_tier = user_data.get("tier", "Standard")
             
-            for attempt in range(MAX_RETRIES):
-                try:
-                    limits_result = fetch_limits(
-                        project_id=settings.GCP_PROJECT_ID,
-                        tier_name=user_tier
-                    )
-                    if limits_result and isinstance(limits_result, dict) and limits_result.get("success"):
-                        tier_limits = limits_result.get("limits", {})
-                        logger.info(f"[{self.name}] Tier limits found for {user_tier}")
-                        break
-                except Exception as e:
-                    logger.warning(f"[{self.name}] Limits fetch attempt {attempt+1}/{MAX_RETRIES} failed: {e}")
-                    if attempt < MAX_RETRIES - 1:
-                        await asyncio.sleep(0.5 * (attempt + 1))
+            limits_outcome, history_outcome = await asyncio.gather(
+                self._fetch_limits(user_tier),
+                self._fetch_history(user_id),
+                return_exceptions=True
+            )
+            
+            tier_limits = None
+            if isinstance(limits_outcome, BaseException):
+                logger.warning(f"[{self.name}] Limits fetch failed: {limits_outcome}")
+            else:
+                tier_limits = limits_outcome
             
-            # ============================================================
-            # STEP 3: Fetch Conversation History with validation
-            # ============================================================
             history_data = None
-            if user_id:
-                for attempt in range(MAX_RETRIES):
-                    try:
-                        history_result = fetch_conversation_history(
-                            project_id=settings.GCP_PROJECT_ID,
-                            customer_id=user_id,
-                            limit=5
-                        )
-                        if history_result and isinstance(history_result, dict) and history_result.get("success"):
-                            history_data = history_result
-                            logger.info(f"[{self.name}] History fetched: {history_result.get('total_calls', 0)} calls")
-                            break
-                    except Exception as e:
-                        logger.warning(f"[{self.name}] History fetch attempt {attempt+1}/{MAX_RETRIES} failed: {e}")
-                        if attempt < MAX_RETRIES - 1:
-                            await asyncio.sleep(0.5 * (attempt + 1))
+            if isinstance(history_outcome, BaseException):
+                logger.warning(f"[{self.name}] History fetch failed: {history_outcome}")
+            else:
+                history_data = history_outcome
             
             # ============================================================
             # STEP 4: Build Result
@@ -189,27 +175,27 @@ class ContextAgent(BaseAgent):
                 item_2_sum=user_data.get("item_2_sum"),
                 standard_excess=user_data.get("standard_excess"),
                 extra_excess=user_data.get("extra_excess"),
-                add_ons=user_data.get("add_ons"),
+                add_ons=user_data.get("add_ons") or [],
                 special_conditions=user_data.get("special_conditions"),
                 tier_limits=tier_limits,
                 has_previous_interactions=history_data.get("has_history", False) if history_data else False,
                 total_previous_calls=history_data.get("total_calls", 0) if history_data else 0,
                 last_topic=history_data.get("last_topic") if history_data else None,
                 last_interaction_date=history_data.get("last_interaction_date") if history_data else None,
-                unresolved_issues=history_data.get("unresolved_issues") if history_data else None,
+                unresolved_issues=(history_data.get("unresolved_issues") or []) if history_data else [],
                 sentiment_trend=history_data.get("sentiment_trend") if history_data else None,
                 conversation_summary=history_data.get("summary") if history_data else None,
                 summary=self._build_summary(user_data, tier_limits, history_data)
             )
             
-            self._safe_store_result(ctx, result)
+            payload = self._safe_store_result(ctx, result)
             
             logger.info(f"[{self.name}] Complete: user={result.user_name}, tier={result.user_tier}")
             
             # Yield completion event
             yield Event(
                 author=self.name,
-                actions=EventActions(state_delta={"customer_context": ctx.session.state.get("customer_context")})
+                actions=EventActions(state_delta={"customer_context": payload})
             )
         
         except Exception as e:
@@ -221,89 +207,181 @@ class ContextAgent(BaseAgent):
                 summary=f"Error fetching user context: {str(e)[:100]}"
             )
             
-            self._safe_store_result(ctx, error_result)
+            payload = self._safe_store_result(ctx, error_result)
             
             yield Event(
                 author=self.name,
                 actions=EventActions(state_delta={
-                    "customer_context": ctx.session.state.get("customer_context"),
+                    "customer_context": payload,
                     "context_error": str(e)[:200]
                 })
             )
     
-    def _safe_store_result(self, ctx: InvocationContext, result: ContextResult) -> None:
-        """Safely store result with multiple fallback levels."""
+    async def _fetch_user(self, user_id: str) -> Tuple[Optional[dict], str]:
+        """Fetch the user profile, returning (user_data, resolved_user_id)."""
+        cache = get_cache()
+        cache_key = customer_cache_key(settings.GCP_PROJECT_ID, user_id)
+        
+        cached = await cache.get(cache_key)
+        if cached:
+            logger.info(f"[{self.name}] User cache hit: {user_id}")
+            return cached, cached.get("user_id") or user_id
+        
+        for attempt in range(MAX_RETRIES):
+            try:
+                user_result = await asyncio.wait_for(fetch_user_async(
+                    project_id=settings.GCP_PROJECT_ID,
+                    user_id=user_id
+                ), timeout=BACKEND_TIMEOUT)
+                
+                if user_result and isinstance(user_result, dict) and user_result.get("success"):
+                    logger.info(f"[{self.name}] User found: {user_result.get('name')}")
+                    await cache.setex(cache_key, settings.CUSTOMER_CACHE_TTL, user_result)
+                    return user_result, user_result.get("user_id") or user_id
+                else:
+                    error_msg = user_result.get("error", "Unknown error") if isinstance(user_result, dict) else "Invalid result type"
+                    logger.warning(f"[{self.name}] User lookup failed: {error_msg}")
+            except asyncio.TimeoutError:
+                logger.warning(f"[{self.name}] User fetch attempt {attempt+1}/{MAX_RETRIES} timed out")
+                if attempt < MAX_RETRIES - 1:
+                    await asyncio.sleep(_backoff_delay(attempt))
+            except Exception as e:
+                logger.warning(f"[{self.name}] User fetch attempt {attempt+1}/{MAX_RETRIES} failed: {e}")
+                if attempt < MAX_RETRIES - 1:
+                    await asyncio.sleep(_backoff_delay(attempt))
+        
+        return None, user_id
+    
+    async def _fetch_limits(self, user_tier: str) -> Optional[dict]:
+        """Fetch tier limits for the user's tier."""
+        cache = get_cache()
+        cache_key = limits_cache_key(settings.GCP_PROJECT_ID, user_tier)
+        
+        cached = await cache.get(cache_key)
+        if cached:
+            logger.info(f"[{self.name}] Tier limits cache hit: {user_tier}")
+            return cached.get("limits", {})
+        
+        for attempt in range(MAX_RETRIES):
+            try:
+                limits_result = await asyncio.wait_for(fetch_limits_async(
+                    project_id=settings.GCP_PROJECT_ID,
+                    tier_name=user_tier
+                ), timeout=BACKEND_TIMEOUT)
+                if limits_result and isinstance(limits_result, dict) and limits_result.get("success"):
+                    logger.info(f"[{self.name}] Tier limits found for {user_tier}")
+                    await cache.setex(cache_key, settings.LIMITS_CACHE_TTL, limits_result)
+                    return limits_result.get("limits", {})
+            except asyncio.TimeoutError:
+                logger.warning(f"[{self.name}] Limits fetch attempt {attempt+1}/{MAX_RETRIES} timed out")
+                if attempt < MAX_RETRIES - 1:
+                    await asyncio.sleep(_backoff_delay(attempt))
+            except Exception as e:
+                logger.warning(f"[{self.name}] Limits fetch attempt {attempt+1}/{MAX_RETRIES} failed: {e}")
+                if attempt < MAX_RETRIES - 1:
+                    await asyncio.sleep(_backoff_delay(attempt))
+        
+        return None
+    
+    async def _fetch_history(self, user_id: str) -> Optional[dict]:
+        """Fetch long-term conversation history for the user."""
+        if not user_id:
+            return None
+        
+        for attempt in range(MAX_RETRIES):
+            try:
+                history_result = await asyncio.wait_for(fetch_conversation_history_async(
+                    project_id=settings.GCP_PROJECT_ID,
+                    user_id=user_id,
+                    limit=5
+                ), timeout=BACKEND_TIMEOUT)
+                if history_result and isinstance(history_result, dict) and history_result.get("success"):
+                    logger.info(f"[{self.name}] History fetched: {history_result.get('total_calls', 0)} calls")
+                    return history_result
+            except asyncio.TimeoutError:
+                logger.warning(f"[{self.name}] History fetch attempt {attempt+1}/{MAX_RETRIES} timed out")
+                if attempt < MAX_RETRIES - 1:
+                    await asyncio.sleep(_backoff_delay(attempt))
+            except Exception as e:
+                logger.warning(f"[{self.name}] History fetch attempt {attempt+1}/{MAX_RETRIES} failed: {e}")
+                if attempt < MAX_RETRIES - 1:
+                    await asyncio.sleep(_backoff_delay(attempt))
+        
+        return None
+    
+    def _safe_store_result(self, ctx: InvocationContext, result: ContextResult) -> str:
+        """
+        Safely store result with multiple fallback levels.
+        
+        The parsed dict is stored under customer_context_obj for in-process
+        consumers (the orchestrator), and the JSON string under
+        customer_context for cross-process consumers.
+        
+        Returns:
+            The serialized JSON string, for use in the event state_delta
+        """
+        context_obj = result.model_dump()
+        ctx.session.state["customer_context_obj"] = context_obj
         try:
-            # Primary: Try JSON serialization
-            ctx.session.state["customer_context"] = result.model_dump_json()
+            # Primary: Fast orjson serialization of the dumped dict
+            payload = orjson.dumps(context_obj).decode()
         except Exception as e1:
-            logger.warning(f"[{self.name}] JSON serialization failed: {e1}, trying dict...")
+            logger.warning(f"[{self.name}] orjson serialization failed: {e1}, trying pydantic...")
             try:
-                # Secondary: Try dict serialization
-                ctx.session.state["customer_context"] = json.dumps(result.model_dump())
+                # Secondary: Pydantic's encoder handles types orjson rejects (e.g. Decimal)
+                payload = result.model_dump_json()
             except Exception as e2:
-                logger.error(f"[{self.name}] Dict serialization failed: {e2}, using minimal fallback")
+                logger.error(f"[{self.name}] Pydantic serialization failed: {e2}, using minimal fallback")
                 # Ultimate fallback: Minimal dict
-                ctx.session.state["customer_context"] = json.dumps({
+                payload = json.dumps({
                     "user_found": False,
                     "summary": "Critical error storing user context"
                 })
+        
+        ctx.session.state["customer_context"] = payload
+        return payload
     
     def _build_summary(self, user: dict, limits: dict, history: dict) -> str:
         """Build a comprehensive summary for downstream agents."""
         try:
-            parts = []
-            
             user = user or {}
-            limits = limits or {}
             history = history or {}
             
             name = user.get("name", "User")
             tier = user.get("tier", "Standard")
-            item_1 = user.get("item_1_sum", 0)
-            extra_excess = user.get("extra_excess", 0)
-            
-            try:
-                item_1 = int(item_1) if item_1 else 0
-            except (ValueError, TypeError):
-                item_1 = 0
-            
-            try:
-                extra_excess = int(extra_excess) if extra_excess else 0
-            except (ValueError, TypeError):
-                extra_excess = 0
+            item_1 = _safe_int(user.get("item_1_sum"))
+            extra_excess = _safe_int(user.get("extra_excess"))
             
             # Basic info
-            parts.append(f"{name} is a {tier} tier user")
+            summary = f"{name} is a {tier} tier user"
             
             if item_1:
-                parts.append(f"with ${item_1:,} item_1 cover")
+                summary += f". with ${item_1:,} item_1 cover"
             
             if extra_excess:
-                parts.append(f"Extra excess: ${extra_excess:,}")
+                summary += f". Extra excess: ${extra_excess:,}"
             
             # History info
-            if history and history.get("has_history"):
+            if history.get("has_history"):
                 total_calls = history.get("total_calls", 0)
                 last_topic = history.get("last_topic")
-                sentiment = history.get("sentiment_trend")
-                unresolved = history.get("unresolved_issues", [])
+                unresolved = history.get("unresolved_issues")
                 
                 if total_calls > 1:
-                    parts.append(f"Returning user ({total_calls} previous calls)")
+                    summary += f". Returning user ({total_calls} previous calls)"
                 
                 if last_topic:
-                    parts.append(f"Last discussed: {last_topic}")
+                    summary += f". Last discussed: {last_topic}"
                 
                 if unresolved:
-                    parts.append(f"Unresolved issues: {', '.join(unresolved)}")
+                    summary += f". Unresolved issues: {', '.join(unresolved)}"
                 
-                if sentiment == "declining":
-                    parts.append("Sentiment declining - handle with care")
+                if history.get("sentiment_trend") == "declining":
+                    summary += ". Sentiment declining - handle with care"
             else:
-                parts.append("This appears to be their first call")
+                summary += ". This appears to be their first call"
             
-            return ". ".join(parts) + "."
+            return summary + "."
         
         except Exception as e:
             logger.error(f"[{self.name}] Error building summary: {e}", exc_info=True)
@@ -327,3 +405,22 @@ def create_customer_context_agent() -> ContextAgent:
     agent = ContextAgent(name="context_agent")
     logger.info("Context Agent created (deterministic mode with full error handling)")
     return agent
+
+
+async def preload_customer_context(user_id: str) -> bool:
+    """
+    Populate the Redis hot cache with a customer's profile and tier limits.
+    
+    Useful ahead of an expected call (e.g. from CTI) so the first turn
+    is served from cache.
+    
+    Returns:
+        True if the customer was found and cached
+    """
+    # A standalone agent - it never joins an agent tree, so it is cheap to build
+    agent = ContextAgent(name="context_agent")
+    user_data, _ = await agent._fetch_user(user_id)
+    if not user_data:
+        return False
+    await agent._fetch_limits(user_data.get("tier", "Standard"))
+    return True
@@ -5,47 +5,19 @@ Detects user identity from multiple sources
 """
 
 import logging
-from pathlib import Path
+from string import Template
 from google.adk.agents import LlmAgent
-from pydantic import BaseModel
-from typing import Optional, List
 
 from app.config import settings
+from app.models import GuardrailsResult
+from app.prompts.loader import load_prompt_text
 
 logger = logging.getLogger(__name__)
 
 
-class GuardrailsResult(BaseModel):
-    """Enhanced guardrails output with identity detection"""
-    category: str
-    action: str
-    sentiment: str
-    confidence: float
-    reason: str
-    detected_issues: List[str]
-    escalation_priority: str
-
-    # NEW: Identity detection fields
-    is_authenticated: bool
-    user_id: Optional[str] = None
-    caller_name: Optional[str] = None
-    phone_number: Optional[str] = None
-
-
 def load_guardrails_prompt() -> str:
-    """Load guardrails prompt with identity detection"""
-    prompt_paths = [
-        Path(__file__).parent.parent / "prompts" / "guardrails.txt",
-        Path("app/prompts/guardrails.txt"),
-    ]
-    
-    for path in prompt_paths:
-        if path.exists():
-            logger.info(f"Loaded guardrails prompt from: {path}")
-            return path.read_text().strip()
-    
-    logger.warning("guardrails.txt not found, using default")
-    return get_default_guardrails_prompt()
+    """Load guardrails prompt with identity detection (cached after first read)"""
+    return load_prompt_text("guardrails.txt") or get_default_guardrails_prompt()
 
 
 def get_default_guardrails_prompt() -> str:
@@ -100,37 +72,34 @@ ALWAYS set is_authenticated: true when user ID is found!
 
 Prioritize session parameters over text detection."""
 
-# In guardrails_agent.py - Replace create_dynamic_instruction()
-def create_dynamic_instruction(ctx):
-    """Inject ACTUAL session state into LLM prompt."""
-    session_state = ctx.session.state or {}
-    
-    user_id = session_state.get("user_id")
-    caller_name = session_state.get("caller_name")
-    
-    base_prompt = load_guardrails_prompt()
-    
-    instruction = base_prompt + f"""
-    
-CURRENT SESSION STATE (PRIORITY #1):
-user_id: {user_id or 'None'}
-caller_name: {caller_name or 'None'}
+# Session state block sent after the (static, cacheable) guardrails prompt
+_SESSION_STATE_TEMPLATE = Template("""CURRENT SESSION STATE (PRIORITY #1):
+user_id: $user_id
+caller_name: $caller_name
 
 CRITICAL: If ANY of above fields have values → is_authenticated: true
-Example: user_id: "12345" → is_authenticated: true"""
+Example: user_id: "12345" → is_authenticated: true""")
+
+
+def create_dynamic_instruction(ctx):
+    """Inject ACTUAL session state into LLM prompt (appended after the static prompt)."""
+    session_state = ctx.session.state or {}
     
-    return instruction
+    return _SESSION_STATE_TEMPLATE.substitute(
+        user_id=session_state.get("user_id") or "None",
+        caller_name=session_state.get("caller_name") or "None",
+    )
 
 
 
 def create_guardrails_agent() -> LlmAgent:
     """Create enhanced guardrails agent with identity detection"""
-
-    prompt = load_guardrails_prompt()
-
     agent = LlmAgent(
         name="guardrails_identity_agent",
         model=settings.MODEL_GUARDRAILS,
+        # Static prompt first so it is a cacheable prefix; only the
+        # session state block changes per turn
+        static_instruction=load_guardrails_prompt(),
         instruction=create_dynamic_instruction,
         output_schema=GuardrailsResult,
         output_key="guardrails_result"
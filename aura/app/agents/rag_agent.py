@@ -3,52 +3,54 @@ RAG Agent - LlmAgent for document search
 """
 
 import logging
-from pathlib import Path
 from typing import Callable
 from google.adk.agents import LlmAgent
 from app.config import settings
-from app.tools.search_policy import get_policy_search_tool
+from app.prompts.loader import load_prompt_text, compile_prompt_template
+from app.tools.search_policy import get_search_tool
 
 logger = logging.getLogger(__name__)
 
 
 def _load_base_prompt() -> str:
-    """Load RAG system prompt from file."""
-    prompt_paths = [
-        Path("app/prompts/rag.txt"),
-        Path("prompts/rag.txt"),
-        Path(__file__).parent.parent / "prompts" / "rag.txt",
-    ]
+    """Load RAG system prompt from file (cached after first read)."""
+    prompt = load_prompt_text("rag.txt")
+    if prompt:
+        return prompt
     
-    for path in prompt_paths:
-        if path.exists():
-            logger.info(f"Loaded RAG prompt from: {path}")
-            return path.read_text().strip()
-    
-    logger.warning("Could not find rag.txt, using minimal prompt")
     return """You are a helpful assistant. Use the search tool to find answers in documents.
     Always cite your sources. Keep answers concise and voice-friendly."""
 
 
+# Per-turn values, appended after the static prompt so the prompt itself
+# stays a byte-identical prefix the model can cache across turns
+_CURRENT_TURN_TEMPLATE = compile_prompt_template(
+    """## CURRENT TURN
+
+Guardrails result: {guardrails_result}
+Original query: {original_query}""",
+    ("guardrails_result", "original_query"),
+)
+
+
 def _create_dynamic_instruction() -> Callable:
     """
     Create a dynamic instruction function that injects session state values.
     
     ADK LlmAgent supports callable instructions that receive the invocation context.
+    Only the per-turn values go here - the base prompt is the agent's
+    static_instruction.
     """
-    base_prompt = _load_base_prompt()
-    
     def dynamic_instruction(ctx) -> str:
         """Build instruction with session state values."""
         # Get values from session state
-        guardrails_result = ctx.session.state.get("guardrails_result", "{}")
-        original_query = ctx.session.state.get("original_query", "")
-        
-        # Replace placeholders in prompt
-        instruction = base_prompt.replace("{guardrails_result}", str(guardrails_result))
-        instruction = instruction.replace("{original_query}", original_query)
+        state = ctx.session.state
         
-        return instruction
+        # Fill all placeholders in one pass
+        return _CURRENT_TURN_TEMPLATE.substitute(
+            guardrails_result=str(state.get("guardrails_result", "{}")),
+            original_query=state.get("original_query", ""),
+        )
     
     return dynamic_instruction
 
@@ -68,12 +70,13 @@ def create_rag_agent() -> LlmAgent:
         LlmAgent configured with VertexAiSearchTool
     """
     # Get the search tool
-    search_tool = get_policy_search_tool()
+    search_tool = get_search_tool()
     
     agent = LlmAgent(
         name="rag_agent",
         model=settings.MODEL_RAG,
         description="Searches documents and provides grounded answers",
+        static_instruction=_load_base_prompt(),  # Cacheable prefix
         instruction=_create_dynamic_instruction(),
         tools=[search_tool],
         output_key="rag_answer",  # Saves to session state
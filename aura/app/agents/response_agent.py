@@ -9,56 +9,57 @@ ENHANCED: Now receives user_context for true personalization:
 """
 
 import logging
-from pathlib import Path
 from typing import Callable
 from google.adk.agents import LlmAgent
 from app.config import settings
+from app.prompts.loader import load_prompt_text, compile_prompt_template
 
 logger = logging.getLogger(__name__)
 
 
 def _load_base_prompt() -> str:
-    """Load response system prompt from file."""
-    prompt_paths = [
-        Path("app/prompts/response.txt"),
-        Path("prompts/response.txt"),
-        Path(__file__).parent.parent / "prompts" / "response.txt",
-    ]
+    """Load response system prompt from file (cached after first read)."""
+    prompt = load_prompt_text("response.txt")
+    if prompt:
+        return prompt
     
-    for path in prompt_paths:
-        if path.exists():
-            logger.info(f"Loaded response prompt from: {path}")
-            return path.read_text().strip()
-    
-    logger.warning("Could not find response.txt, using minimal prompt")
     return """You format answers for voice delivery with personalization.
     Output JSON with: decision (respond/escalate), speech_text, should_escalate, escalation_reason, follow_up_prompt"""
 
 
+# Per-turn values, appended after the static prompt so the prompt itself
+# stays a byte-identical prefix the model can cache across turns
+_CURRENT_TURN_TEMPLATE = compile_prompt_template(
+    """## CURRENT TURN
+
+User Context: {user_context}
+Guardrails Result: {guardrails_result}
+RAG Answer: {rag_answer}
+Original Query: {original_query}""",
+    ("user_context", "guardrails_result", "rag_answer", "original_query"),
+)
+
+
 def _create_dynamic_instruction() -> Callable:
     """
     Create a dynamic instruction function that injects session state values.
     
     ADK LlmAgent supports callable instructions that receive the invocation context.
-    Now includes user_context for personalization!
+    Now includes user_context for personalization! Only the per-turn values
+    go here - the base prompt is the agent's static_instruction.
     """
-    base_prompt = _load_base_prompt()
-    
     def dynamic_instruction(ctx) -> str:
         """Build instruction with session state values including user context."""
         # Get values from session state
-        guardrails_result = ctx.session.state.get("guardrails_result", "{}")
-        rag_answer = ctx.session.state.get("rag_answer", "")
-        original_query = ctx.session.state.get("original_query", "")
-        user_context = ctx.session.state.get("user_context", "{}")
-        
-        # Replace placeholders in prompt
-        instruction = base_prompt.replace("{guardrails_result}", str(guardrails_result))
-        instruction = instruction.replace("{rag_answer}", str(rag_answer))
-        instruction = instruction.replace("{original_query}", original_query)
-        instruction = instruction.replace("{user_context}", str(user_context))
+        state = ctx.session.state
         
-        return instruction
+        # Fill all placeholders in one pass
+        return _CURRENT_TURN_TEMPLATE.substitute(
+            user_context=str(state.get("user_context", "{}")),
+            guardrails_result=str(state.get("guardrails_result", "{}")),
+            rag_answer=str(state.get("rag_answer", "")),
+            original_query=state.get("original_query", ""),
+        )
     
     return dynamic_instruction
 
@@ -84,6 +85,7 @@ def create_response_agent() -> LlmAgent:
         name="response_agent",
         model=settings.MODEL_RESPONSE,
         description="Formats personalized answers for voice delivery and decides on escalation",
+        static_instruction=_load_base_prompt(),  # Cacheable prefix
         instruction=_create_dynamic_instruction(),
         output_key="final_response",  # Saves to session state
     )
@@ -12,28 +12,86 @@ This agent runs at the end of the conversation to:
 3. Generate a summary for agent handoff
 """
 
-import json
+import asyncio
 import logging
+import random
+from functools import lru_cache
 from pathlib import Path
-from typing import Optional, List, Dict, Any, AsyncGenerator
+from types import MappingProxyType
+from typing import Optional, List, Dict, Any, AsyncGenerator, Mapping
 from datetime import datetime, timezone
 from typing_extensions import override
 
 from google.adk.agents import BaseAgent
 from google.adk.agents.invocation_context import InvocationContext
 from google.adk.events import Event, EventActions
-from google.genai import types
 from pydantic import BaseModel
+import orjson
 
 from app.config import settings
-from app.tools.conversation_memory import save_conversation, get_agent_handoff_context
-from app.tools.telemetry import log_telemetry
+from app.agents._session import snapshot
+from app.tools.conversation_memory import save_conversation_async, get_agent_handoff_context_async
+from app.tools.telemetry import log_telemetry, build_telemetry_row, get_telemetry_batcher
 
 logger = logging.getLogger(__name__)
 
 # Maximum retries for GCP operations
 MAX_RETRIES = 2
 
+# Base delay (seconds) before each retry, indexed by failed attempt
+_BACKOFF = (0.1, 0.4)
+
+
+def _backoff_delay(attempt: int) -> float:
+    """Backoff with jitter so transient GCP errors clear and retries don't align."""
+    return _BACKOFF[min(attempt, len(_BACKOFF) - 1)] + random.uniform(0, 0.05)
+
+
+# Direct telemetry writes (no batcher running) happen behind the response:
+# cap how many run at once, and keep references so tasks aren't GC'd mid-flight
+_MAX_BACKGROUND_TELEMETRY = 64
+_telemetry_slots: Optional[asyncio.Semaphore] = None
+_bg_tasks: set = set()
+
+
+def _telemetry_semaphore() -> asyncio.Semaphore:
+    global _telemetry_slots
+    if _telemetry_slots is None:
+        _telemetry_slots = asyncio.Semaphore(_MAX_BACKGROUND_TELEMETRY)
+    return _telemetry_slots
+
+
+# Social turns carry no content worth saving to long-term memory
+_SOCIAL_CATEGORIES = frozenset({"greeting", "thanks", "goodbye"})
+
+# Guardrails category -> topic classification
+_CATEGORY_TO_TOPIC: Mapping[str, str] = MappingProxyType({
+    "user_question": "user_question",
+    "claims": "claims_inquiry",
+    "billing": "billing_question",
+    "account_change": "account_change",
+    "complaint": "complaint",
+    "greeting": "general_inquiry",
+    "thanks": "general_inquiry",
+    "goodbye": "general_inquiry",
+    "out_of_scope": "general_inquiry",
+})
+
+# Topic -> wording used in conversation summaries
+_TOPIC_DESC: Mapping[str, str] = MappingProxyType({
+    "user_question": "their account",
+    "claims_inquiry": "claims",
+    "billing_question": "billing",
+    "account_change": "account changes",
+    "complaint": "a complaint",
+    "general_inquiry": "general information",
+})
+
+
+async def _noop() -> None:
+    """Placeholder for a write step that doesn't apply to this turn."""
+    return None
+
 
 class WriteResult(BaseModel):
     """Output schema for write agent"""
@@ -67,34 +125,37 @@ class WriteAgent(BaseAgent):
         self, ctx: InvocationContext
     ) -> AsyncGenerator[Event, None]:
         """Execute write operations deterministically."""
+        write_result_json = await self._write(ctx)
+        
+        # Yield completion event (no content to user)
+        yield Event(
+            author=self.name,
+            actions=EventActions(state_delta={"write_result": write_result_json})
+        )
+    
+    async def run_and_discard(self, ctx: InvocationContext) -> None:
+        """
+        Execute write operations without producing Events.
+        
+        For callers that would discard the events anyway (the orchestrator's
+        background write) - skips the async generator machinery entirely.
+        """
+        await self._write(ctx)
+    
+    async def _write(self, ctx: InvocationContext) -> str:
+        """Run all write operations and return the stored WriteResult JSON."""
         
         logger.info(f"[{self.name}] Starting deterministic write operations")
         
         errors = []
-        telemetry_logged = False
-        conversation_saved = False
         
         # Extract context from session state
-        original_query = ctx.session.state.get("original_query", "")
-        final_response = ctx.session.state.get("final_response", "")
-        guardrails_result = ctx.session.state.get("guardrails_result", {})
-        user_context = ctx.session.state.get("user_context", {})
-        user_id = ctx.session.state.get("user_id", "")
-        session_id = ctx.session.state.get("session_id", "unknown")
-        
-        # Parse guardrails result
-        if isinstance(guardrails_result, str):
-            try:
-                guardrails_result = json.loads(guardrails_result)
-            except:
-                guardrails_result = {}
-        
-        # Parse user context
-        if isinstance(user_context, str):
-            try:
-                user_context = json.loads(user_context)
-            except:
-                user_context = {}
+        session = snapshot(ctx)
+        original_query = session.original_query
+        final_response = session.final_response
+        guardrails_result = session.guardrails_result
+        user_id = session.user_id
+        session_id = session.session_id
         
         # Determine classification from guardrails
         category = guardrails_result.get("category", "general_inquiry")
@@ -103,11 +164,12 @@ class WriteAgent(BaseAgent):
         
         # Determine if escalated
         was_escalated = False
-        if isinstance(final_response, str):
+        # Only JSON objects carry should_escalate - skip the parse otherwise
+        if isinstance(final_response, str) and final_response.lstrip().startswith("{"):
             try:
-                final_data = json.loads(final_response)
+                final_data = orjson.loads(final_response)
                 was_escalated = final_data.get("should_escalate", False)
-            except:
+            except orjson.JSONDecodeError:
                 pass
         
         # Map category to topic
@@ -118,81 +180,65 @@ class WriteAgent(BaseAgent):
         summary = self._generate_summary(original_query, topic, resolution_status)
         
         # ============================================================
-        # STEP 1: Log Telemetry (always, even for guests)
+        # Telemetry and the conversation save are independent backend
+        # calls - run them concurrently. The handoff context reads the
+        # history back, so it waits for the save to include this turn.
         # ============================================================
-        for attempt in range(MAX_RETRIES):
-            try:
-                result = log_telemetry(
-                    project_id=settings.GCP_PROJECT_ID,
-                    session_id=session_id,
-                    user_id=user_id if user_id else None,
-                    is_authenticated=is_authenticated,
-                    category=category,
-                    sentiment=sentiment,
-                    topic=topic,
-                    action_taken="respond" if not was_escalated else "escalate",
-                    was_escalated=was_escalated,
-                    resolution_status=resolution_status,
-                    flow_type="authenticated" if is_authenticated else "guest",
-                    query_length=len(original_query),
-                    response_length=len(str(final_response))
-                )
-                if result.get("success"):
-                    telemetry_logged = True
-                    logger.info(f"[{self.name}] Telemetry logged successfully")
-                    break
-                else:
-                    errors.append(f"Telemetry attempt {attempt+1}: {result.get('error')}")
-            except Exception as e:
-                errors.append(f"Telemetry attempt {attempt+1}: {str(e)}")
-                logger.warning(f"[{self.name}] Telemetry failed (attempt {attempt+1}): {e}")
-        
-        # ============================================================
-        # STEP 2: Save Conversation (only for authenticated users)
-        # ============================================================
-        if user_id and is_authenticated:
-            for attempt in range(MAX_RETRIES):
-                try:
-                    result = save_conversation(
-                        project_id=settings.GCP_PROJECT_ID,
-                        user_id=user_id,
-                        session_id=session_id,
-                        query=original_query[:500],
-                        response=str(final_response)[:1000],
-                        topic=topic,
-                        sentiment=sentiment,
-                        was_escalated=was_escalated,
-                        resolution_status=resolution_status
-                    )
-                    if result.get("success"):
-                        conversation_saved = True
-                        logger.info(f"[{self.name}] Conversation saved for {user_id}")
-                        break
-                    else:
-                        errors.append(f"Save attempt {attempt+1}: {result.get('error')}")
-                except Exception as e:
-                    errors.append(f"Save attempt {attempt+1}: {str(e)}")
-                    logger.warning(f"[{self.name}] Save failed (attempt {attempt+1}): {e}")
-        else:
+        should_save = bool(user_id and is_authenticated)
+        if not should_save:
             logger.info(f"[{self.name}] Skipping conversation save (guest user)")
+        elif category in _SOCIAL_CATEGORIES and not was_escalated:
+            # Nothing worth remembering in a greeting - telemetry only
+            should_save = False
+            logger.info(f"[{self.name}] Skipping conversation save ({category})")
+        
+        results = await asyncio.gather(
+            # STEP 1: Log Telemetry (always, even for guests)
+            self._log_telemetry(
+                project_id=settings.GCP_PROJECT_ID,
+                session_id=session_id,
+                user_id=user_id if user_id else None,
+                is_authenticated=is_authenticated,
+                category=category,
+                sentiment=sentiment,
+                topic=topic,
+                action_taken="respond" if not was_escalated else "escalate",
+                was_escalated=was_escalated,
+                resolution_status=resolution_status,
+                flow_type="authenticated" if is_authenticated else "guest",
+                query_length=len(original_query),
+                response_length=len(str(final_response)),
+                metadata={"semantic_cache_hit": session.semantic_cache_hit}
+            ),
+            # STEP 2: Save Conversation (only for authenticated users)
+            self._save_conversation(
+                errors,
+                project_id=settings.GCP_PROJECT_ID,
+                user_id=user_id,
+                session_id=session_id,
+                query=original_query[:500],
+                response=str(final_response)[:1000],
+                topic=topic,
+                sentiment=sentiment,
+                was_escalated=was_escalated,
+                resolution_status=resolution_status
+            ) if should_save else _noop(),
+            return_exceptions=True,
+        )
+        telemetry_logged, conversation_saved = (
+            False if isinstance(result, BaseException) else bool(result)
+            for result in results
+        )
         
-        # ============================================================
         # STEP 3: Prepare handoff context (if escalated)
-        # ============================================================
         handoff_context = None
         if was_escalated and user_id:
-            try:
-                result = get_agent_handoff_context(
-                    project_id=settings.GCP_PROJECT_ID,
-                    user_id=user_id,
-                    current_session_summary=summary
-                )
-                if result.get("success"):
-                    handoff_context = result.get("handoff_context")
-                    logger.info(f"[{self.name}] Handoff context prepared")
-            except Exception as e:
-                errors.append(f"Handoff context: {str(e)}")
-                logger.warning(f"[{self.name}] Handoff context failed: {e}")
+            handoff_context = await self._prepare_handoff(
+                errors,
+                project_id=settings.GCP_PROJECT_ID,
+                user_id=user_id,
+                current_session_summary=summary
+            )
         
         # ============================================================
         # Build final result
@@ -210,50 +256,98 @@ class WriteAgent(BaseAgent):
         )
         
         # Store result in session state
-        ctx.session.state["write_result"] = write_result.model_dump_json()
+        write_result_json = write_result.model_dump_json()
+        ctx.session.state["write_result"] = write_result_json
         
         logger.info(
             f"[{self.name}] Complete: telemetry={telemetry_logged}, "
             f"saved={conversation_saved}, errors={len(errors)}"
         )
         
-        # Yield completion event (no content to user)
-        yield Event(
-            author=self.name,
-            actions=EventActions(state_delta={"write_result": write_result.model_dump_json()})
-        )
+        return write_result_json
+    
+    async def _log_telemetry(self, **fields) -> bool:
+        """
+        Hand telemetry off without waiting for BigQuery. Returns True once queued.
+
+        Goes to the background batcher when the app is running it, otherwise
+        to a background task that writes it directly with retries - either
+        way the insert is off the response path, and failures are only logged.
+        """
+        project_id = fields.pop("project_id")
+        
+        if get_telemetry_batcher(project_id).enqueue(build_telemetry_row(**fields)):
+            return True
+        
+        task = asyncio.create_task(self._log_telemetry_direct(project_id, fields))
+        _bg_tasks.add(task)
+        task.add_done_callback(_bg_tasks.discard)
+        return True
+    
+    async def _log_telemetry_direct(self, project_id: str, fields: Dict[str, Any]) -> bool:
+        """Write telemetry straight to BigQuery with retries. Returns True once logged."""
+        async with _telemetry_semaphore():
+            for attempt in range(MAX_RETRIES):
+                try:
+                    result = await asyncio.to_thread(log_telemetry, project_id=project_id, **fields)
+                    if result.get("success"):
+                        logger.info(f"[{self.name}] Telemetry logged successfully")
+                        return True
+                    logger.warning(
+                        f"[{self.name}] Telemetry failed (attempt {attempt+1}): {result.get('error')}"
+                    )
+                except Exception as e:
+                    logger.warning(f"[{self.name}] Telemetry failed (attempt {attempt+1}): {e}")
+                if attempt + 1 < MAX_RETRIES:
+                    await asyncio.sleep(_backoff_delay(attempt))
+        return False
+    
+    async def _save_conversation(self, errors: List[str], **fields) -> bool:
+        """Save the conversation with retries. Returns True once saved."""
+        for attempt in range(MAX_RETRIES):
+            try:
+                result = await save_conversation_async(**fields)
+                if result.get("success"):
+                    logger.info(f"[{self.name}] Conversation saved for {fields['user_id']}")
+                    return True
+                errors.append(f"Save attempt {attempt+1}: {result.get('error')}")
+            except Exception as e:
+                errors.append(f"Save attempt {attempt+1}: {str(e)}")
+                logger.warning(f"[{self.name}] Save failed (attempt {attempt+1}): {e}")
+            if attempt + 1 < MAX_RETRIES:
+                await asyncio.sleep(_backoff_delay(attempt))
+        return False
+    
+    async def _prepare_handoff(self, errors: List[str], **fields) -> Optional[dict]:
+        """Build the human-agent handoff context, or None on failure."""
+        try:
+            result = await get_agent_handoff_context_async(**fields)
+            if result.get("success"):
+                logger.info(f"[{self.name}] Handoff context prepared")
+                return result.get("handoff_context")
+        except Exception as e:
+            errors.append(f"Handoff context: {str(e)}")
+            logger.warning(f"[{self.name}] Handoff context failed: {e}")
+        return None
     
     def _map_category_to_topic(self, category: str) -> str:
         """Map guardrails category to topic classification."""
-        mapping = {
-            "user_question": "user_question",
-            "claims": "claims_inquiry",
-            "billing": "billing_question",
-            "account_change": "account_change",
-            "complaint": "complaint",
-            "greeting": "general_inquiry",
-            "thanks": "general_inquiry",
-            "goodbye": "general_inquiry",
-            "out_of_scope": "general_inquiry",
-        }
-        return mapping.get(category, "general_inquiry")
+        return _CATEGORY_TO_TOPIC.get(category, "general_inquiry")
     
     def _generate_summary(self, query: str, topic: str, resolution: str) -> str:
         """Generate a simple conversation summary."""
-        topic_desc = {
-            "user_question": "their account",
-            "claims_inquiry": "claims",
-            "billing_question": "billing",
-            "account_change": "account changes",
-            "complaint": "a complaint",
-            "general_inquiry": "general information"
-        }
-        topic_text = topic_desc.get(topic, "their account")
-        
-        if resolution == "escalated":
-            return f"User asked about {topic_text}. Transferred to human agent for assistance."
-        else:
-            return f"User asked about {topic_text}. Query was resolved."
+        return _summary_text(topic, resolution)
+
+
+@lru_cache(maxsize=256)
+def _summary_text(topic: str, resolution: str) -> str:
+    """Summary text for a (topic, resolution) pair - the query isn't part of it."""
+    topic_text = _TOPIC_DESC.get(topic, "their account")
+    
+    if resolution == "escalated":
+        return f"User asked about {topic_text}. Transferred to human agent for assistance."
+    else:
+        return f"User asked about {topic_text}. Query was resolved."
 
 
 def create_write_agent() -> WriteAgent:
@@ -3,18 +3,23 @@ Application Configuration
 """
 
 import os
+from dataclasses import dataclass, fields
 from pathlib import Path
-from pydantic_settings import BaseSettings
 from functools import lru_cache
 
-# Load .env file from the project root
-from dotenv import load_dotenv
-_env_path = Path(__file__).parent.parent / ".env"
-load_dotenv(_env_path)
+# Load .env files locally - Cloud Run (K_SERVICE set) injects env vars directly
+if not os.environ.get("K_SERVICE"):
+    from dotenv import load_dotenv
+    _env_path = Path(__file__).parent.parent / ".env"
+    load_dotenv(_env_path)
+    load_dotenv(".env")
 
+_TRUE_VALUES = frozenset({"1", "true", "yes", "on"})
 
-class Settings(BaseSettings):
-    """Application settings loaded from environment."""
+
+@dataclass(frozen=True, slots=True)
+class Settings:
+    """Application settings loaded from environment (see from_env)."""
     
     # GCP Settings - support both naming conventions
     GCP_PROJECT_ID: str = ""
@@ -25,6 +30,29 @@ class Settings(BaseSettings):
     # Vertex AI Search
     VERTEX_SEARCH_DATASTORE_ID: str = ""
     
+    # Firestore gRPC clients shared round-robin by the tools
+    FIRESTORE_POOL_SIZE: int = 4
+    
+    # Telemetry batches via the BigQuery Storage Write API (off = insert_rows_json)
+    TELEMETRY_STORAGE_WRITE: bool = True
+    
+    # "stream" (low latency) or "load" (free BigQuery load jobs, minutes of delay)
+    TELEMETRY_MODE: str = "stream"
+    
+    # Days interaction records are kept (Firestore TTL policy on expire_at)
+    CONVERSATION_RETENTION_DAYS: int = 365
+    
+    # Redis hot cache and shared ADK sessions (optional - leave empty to disable)
+    REDIS_URL: str = ""
+    CUSTOMER_CACHE_TTL: int = 300     # Seconds - profiles are near-static per session
+    LIMITS_CACHE_TTL: int = 3600      # Seconds - tier limits are reference data
+    GUARDRAILS_CACHE_TTL: int = 60    # Seconds - repeat queries skip the LLM call
+    SESSION_TTL: int = 1800           # Seconds - sliding expiry of Redis-backed ADK sessions
+    
+    # Semantic answer cache (in-process, needs numpy)
+    SEMANTIC_CACHE_ENABLED: bool = False
+    SEMANTIC_CACHE_THRESHOLD: float = 0.92  # Min cosine similarity for a hit
+    
     # Model Settings
     MODEL_GUARDRAILS: str = "gemini-2.0-flash"  # Fast for classification
     MODEL_RAG: str = "gemini-2.0-flash"         # Smart for RAG
@@ -38,26 +66,32 @@ class Settings(BaseSettings):
     APP_NAME: str = "adk-agent"
     LOG_LEVEL: str = "INFO"
     
-    def __init__(self, **kwargs):
-        super().__init__(**kwargs)
+    @classmethod
+    def from_env(cls) -> "Settings":
+        """Build settings from environment variables named like the fields."""
+        values = {}
+        for field in fields(cls):
+            raw = os.environ.get(field.name)
+            if raw is None:
+                continue
+            if field.type is bool:
+                values[field.name] = raw.strip().lower() in _TRUE_VALUES
+            elif field.type in (int, float):
+                values[field.name] = field.type(raw)
+            else:
+                values[field.name] = raw
+        
         # Fallback: use GOOGLE_CLOUD_PROJECT if GCP_PROJECT_ID not set
-        if not self.GCP_PROJECT_ID and self.GOOGLE_CLOUD_PROJECT:
-            object.__setattr__(self, 'GCP_PROJECT_ID', self.GOOGLE_CLOUD_PROJECT)
-        # Fallback: use GOOGLE_CLOUD_LOCATION if GCP_LOCATION not set (for non-global)
-        if self.GCP_LOCATION == "global" and self.GOOGLE_CLOUD_LOCATION:
-            # Keep global for Vertex Search, but this allows override
-            pass
-    
-    class Config:
-        env_file = ".env"
-        env_file_encoding = "utf-8"
-        extra = "ignore"
+        if not values.get("GCP_PROJECT_ID") and values.get("GOOGLE_CLOUD_PROJECT"):
+            values["GCP_PROJECT_ID"] = values["GOOGLE_CLOUD_PROJECT"]
+        
+        return cls(**values)
 
 
-@lru_cache()
+@lru_cache(maxsize=1)
 def get_settings() -> Settings:
     """Get cached settings instance."""
-    return Settings()
+    return Settings.from_env()
 
 
 settings = get_settings()
\ No newline at end of file
@@ -36,7 +36,7 @@ class SentimentLabel(str, Enum):
 
 
 class GuardrailsResult(BaseModel):
-    """Result from guardrails classification."""
+    """Result from guardrails classification, including identity detection."""
     
     category: GuardrailCategory = Field(
         description="Classification of the query type"
@@ -66,6 +66,24 @@ class GuardrailsResult(BaseModel):
         description="Priority level: normal, high, urgent"
     )
     
+    # Identity detection
+    is_authenticated: bool = Field(
+        default=False,
+        description="Whether a user identity was found in session or query"
+    )
+    user_id: Optional[str] = Field(
+        default=None,
+        description="Detected user ID"
+    )
+    caller_name: Optional[str] = Field(
+        default=None,
+        description="Detected caller name"
+    )
+    phone_number: Optional[str] = Field(
+        default=None,
+        description="Detected phone number"
+    )
+    
     class Config:
         use_enum_values = True
 
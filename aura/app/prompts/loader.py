@@ -0,0 +1,69 @@
+"""
+Prompt Loader - Reads prompt files once per process
+
+Agents build their instructions on every turn, so prompt text is cached
+after the first read instead of touching the filesystem each time, and
+placeholder prompts are compiled once into string.Template objects.
+"""
+
+import logging
+from functools import lru_cache
+from pathlib import Path
+from string import Template
+from typing import Iterable, Optional
+
+logger = logging.getLogger(__name__)
+
+_PROMPTS_DIR = Path(__file__).parent
+
+
+@lru_cache(maxsize=None)
+def load_prompt_text(filename: str) -> Optional[str]:
+    """
+    Load a prompt file from the prompts directory.
+
+    Args:
+        filename: Prompt file name, e.g. "rag.txt"
+
+    Returns:
+        The stripped prompt text, or None if the file can't be found
+        (callers fall back to their built-in default prompt)
+    """
+    prompt_paths = [
+        _PROMPTS_DIR / filename,
+        Path("app/prompts") / filename,
+        Path("prompts") / filename,
+    ]
+
+    # Read directly instead of exists() + read - one syscall per candidate
+    for path in prompt_paths:
+        try:
+            prompt = path.read_text().strip()
+        except (FileNotFoundError, IsADirectoryError):
+            continue
+        logger.info(f"Loaded prompt from: {path}")
+        return prompt
+
+    logger.warning(f"{filename} not found, using default prompt")
+    return None
+
+
+def compile_prompt_template(prompt: str, placeholders: Iterable[str]) -> Template:
+    """
+    Compile a prompt with {name} placeholders into a string.Template.
+
+    Literal "$" in the prompt (e.g. "$250") is escaped first, so only the
+    named placeholders are substituted - in a single pass, which also rules
+    out substituted values being substituted again.
+
+    Args:
+        prompt: Prompt text using {name} placeholders
+        placeholders: Names of the placeholders to substitute
+
+    Returns:
+        Template to fill with .substitute(name=value, ...)
+    """
+    text = prompt.replace("$", "$$")
+    for name in placeholders:
+        text = text.replace("{" + name + "}", "${" + name + "}")
+    return Template(text)
@@ -1,11 +1,11 @@
 # app/tools/__init__.py
 
-from app.tools.search_policy import get_policy_search_tool, build_datastore_path
-from app.tools.fetch_customer import fetch_customer
+from app.tools.search_policy import get_search_tool, build_datastore_path
+from app.tools.fetch_customer import fetch_user, fetch_customer
 from app.tools.fetch_limits import fetch_limits
 from app.tools.conversation_memory import (
     fetch_conversation_history,
     save_conversation,
     get_agent_handoff_context,
 )
-from app.tools.telemetry import log_telemetry, get_customer_analytics
+from app.tools.telemetry import log_telemetry, get_user_analytics, get_telemetry_batcher
@@ -0,0 +1,86 @@
+"""
+Shared Google Cloud clients
+
+One set of clients per project and kind for the whole process: every tool
+that talks to Firestore or BigQuery shares the same channels, auth flow and
+connection pools instead of creating its own.
+
+Firestore clients are pooled (FIRESTORE_POOL_SIZE, round-robin) - a single
+gRPC channel caps the number of concurrent streams, and every turn issues
+several Firestore reads and writes across many concurrent sessions.
+"""
+
+import itertools
+import logging
+import threading
+from typing import TYPE_CHECKING, Any, Callable, Dict, List, Tuple
+
+from app.config import settings
+
+logger = logging.getLogger(__name__)
+
+if TYPE_CHECKING:
+    from google.cloud import bigquery, firestore
+
+_pools: Dict[Tuple[str, str], List[Any]] = {}
+_round_robin = itertools.count()
+# Tools run in worker threads as well as on the event loop
+_pools_lock = threading.Lock()
+
+
+def _get_pool(kind: str, project_id: str, factory: Callable[[], Any], size: int = 1) -> List[Any]:
+    """Return the clients for (kind, project_id), creating them on first use."""
+    key = (kind, project_id)
+    pool = _pools.get(key)
+    if pool is None:
+        with _pools_lock:
+            pool = _pools.get(key)
+            if pool is None:
+                pool = [factory() for _ in range(max(size, 1))]
+                _pools[key] = pool
+                logger.info(f"Initialized {len(pool)} {kind} client(s) for project: {project_id}")
+    return pool
+
+
+def _next_client(pool: List[Any]) -> Any:
+    """Pick the next client round-robin (itertools.count is atomic under the GIL)."""
+    return pool[next(_round_robin) % len(pool)]
+
+
+def _firestore_factory(project_id: str) -> "firestore.Client":
+    from google.cloud import firestore  # Deferred to first use - slow to import
+    return firestore.Client(project=project_id)
+
+
+def _async_firestore_factory(project_id: str) -> "firestore.AsyncClient":
+    from google.cloud import firestore  # Deferred to first use - slow to import
+    return firestore.AsyncClient(project=project_id)
+
+
+def get_firestore(project_id: str) -> "firestore.Client":
+    """Get a Firestore client from the shared pool."""
+    return _next_client(_get_pool(
+        "Firestore", project_id,
+        lambda: _firestore_factory(project_id), settings.FIRESTORE_POOL_SIZE,
+    ))
+
+
+def get_async_firestore_pool(project_id: str) -> List["firestore.AsyncClient"]:
+    """Get every async Firestore client in the shared pool (for warmup)."""
+    return _get_pool(
+        "async Firestore", project_id,
+        lambda: _async_firestore_factory(project_id), settings.FIRESTORE_POOL_SIZE,
+    )
+
+
+def get_async_firestore(project_id: str) -> "firestore.AsyncClient":
+    """Get an async Firestore client from the shared pool."""
+    return _next_client(get_async_firestore_pool(project_id))
+
+
+def get_bigquery(project_id: str) -> "bigquery.Client":
+    """Get the shared BigQuery client (HTTP - it pools connections itself)."""
+    def factory():
+        from google.cloud import bigquery  # Deferred to first use - slow to import
+        return bigquery.Client(project=project_id)
+    return _get_pool("BigQuery", project_id, factory)[0]
@@ -2,7 +2,17 @@
 Conversation Memory Tool - Long-term memory for "pick up where we left off"
 
 Stores and retrieves conversation history per user from a database.
-Collection: conversation_history/{user_id}
+Collection: conversation_history/{user_id} - per-user summary document
+            conversation_history/{user_id}/interactions/{auto_id} - one per turn
+
+Saving a turn is a single batched write of one small record plus summary
+counters; reads fetch the summary and the most recent interactions only.
+
+Interaction records carry expire_at (CONVERSATION_RETENTION_DAYS after the
+turn) and are deleted by a Firestore TTL policy on that field - deploy.sh
+enables it for the "interactions" collection group. Summary documents
+written before the subcollection existed have an inline "interactions"
+array; the first read moves it into the subcollection and drops it.
 
 This enables:
 - "Welcome back, I see you called about X last time"
@@ -11,27 +21,362 @@ This enables:
 - Agent handoff context
 """
 
-from google.cloud import firestore
-from datetime import datetime, timezone
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta, timezone
+import asyncio
 import logging
+import threading
+import time
 from typing import Optional, List, Dict, Any
 
-logger = logging.getLogger(__name__)
+from cachetools import TTLCache
 
-# Global Firestore client
-_firestore_client = None
+from app.config import settings
+from app.tools._clients import (
+    get_async_firestore as _get_async_firestore_client,
+    get_async_firestore_pool,
+    get_firestore as _get_firestore_client,
+)
+from app.tools.fetch_customer import fetch_user, fetch_user_async
+
+logger = logging.getLogger(__name__)
 
 COLLECTION_NAME = "conversation_history"
-MAX_STORED_INTERACTIONS = 20  # Keep last 20 interactions per customer
+INTERACTIONS_COLLECTION = "interactions"
+MAX_RECENT_INTERACTIONS = 20  # Interactions read back per user
+_RETENTION = timedelta(days=settings.CONVERSATION_RETENTION_DAYS)
+
+# Short-lived cache of history documents, so repeat turns in a session
+# (and handoff after a lookup) don't re-read Firestore. None = no document.
+_history_cache: TTLCache = TTLCache(maxsize=1024, ttl=30)
+_history_cache_lock = threading.Lock()  # Tools run in worker threads
+_MISS = object()
+# Summary fields the readers use ("interactions" only exists on legacy documents not yet migrated)
+_SUMMARY_FIELDS = [
+    "total_interactions",
+    "unresolved_issues",
+    "sentiment_trend",
+    "sentiment_trend_total",
+    "interactions",
+]
+# Longer-lived (summary update_time, history) pairs: once the short cache
+# expires, an unchanged summary means the recent interactions needn't be
+# queried again. Every save rewrites the summary, so update_time is a version.
+# Only histories read from Firestore are versioned, never ones applied locally.
+_history_versions: TTLCache = TTLCache(maxsize=1024, ttl=600)
+# Runs the sync handoff lookups concurrently
+_io_pool = ThreadPoolExecutor(max_workers=8, thread_name_prefix="conversation-memory")
+# In-flight async history reads, so concurrent misses share one Firestore RPC
+_inflight_reads: Dict[tuple, "asyncio.Future"] = {}
+
+_SENTIMENT_SCORES = {
+    "positive": 2,
+    "neutral": 1,
+    "negative": -1,
+    "frustrated": -2,
+}
+
+
+async def warm_clients(project_id: str) -> None:
+    """Create the pooled async clients and open their channels before the first request."""
+    async def warm(db) -> None:
+        async for _ in db.collection(COLLECTION_NAME).limit(1).stream():
+            pass
+    
+    started = time.perf_counter()
+    await asyncio.gather(*(warm(db) for db in get_async_firestore_pool(project_id)))
+    logger.info(f"Conversation memory client warmed in {(time.perf_counter() - started) * 1000:.0f} ms")
+
+
+def _get_history_doc(project_id: str, user_id: str) -> Optional[dict]:
+    """Read a user's history document through the TTL cache (None if absent)."""
+    key = (project_id, user_id)
+    with _history_cache_lock:
+        data = _history_cache.get(key, _MISS)
+    if data is not _MISS:
+        return data
+    
+    db = _get_firestore_client(project_id)
+    summary = db.collection(COLLECTION_NAME).document(user_id).get(field_paths=_SUMMARY_FIELDS)
+    data = None
+    if summary.exists:
+        data = _unchanged_history(project_id, user_id, summary)
+        if data is None:
+            recent = [doc.to_dict() for doc in _recent_interactions_query(db, user_id).stream()]
+            summary_data = summary.to_dict()
+            data = _compose_history(summary_data, recent)
+            if summary_data.get("interactions"):
+                _migrate_legacy_interactions(db, user_id, summary_data["interactions"])
+    
+    _cache_history_doc(project_id, user_id, data, summary.update_time if data else None)
+    return data
+
+
+async def _get_history_doc_async(project_id: str, user_id: str) -> Optional[dict]:
+    """
+    Async version of _get_history_doc, sharing the same cache.
+
+    Concurrent misses for the same user share one in-flight read. The read
+    runs as its own task and callers await it shielded, so a caller timing
+    out doesn't cancel the read for the others.
+    """
+    data = _peek_history_doc(project_id, user_id)
+    if data is not _MISS:
+        return data
+    
+    key = (project_id, user_id)
+    read = _inflight_reads.get(key)
+    if read is None:
+        read = asyncio.ensure_future(_read_history_doc_async(project_id, user_id))
+        _inflight_reads[key] = read
+        read.add_done_callback(lambda _: _inflight_reads.pop(key, None))
+    return await asyncio.shield(read)
+
+
+async def _read_history_doc_async(project_id: str, user_id: str) -> Optional[dict]:
+    """Read a user's summary and recent interactions from Firestore and cache them."""
+    db = _get_async_firestore_client(project_id)
+    summary_ref = db.collection(COLLECTION_NAME).document(user_id)
+    
+    async def read_recent() -> List[dict]:
+        return [doc.to_dict() async for doc in _recent_interactions_query(db, user_id).stream()]
+    
+    legacy = None
+    if _has_known_version(project_id, user_id):
+        # Check the small summary first - unchanged history skips the query
+        summary = await summary_ref.get(field_paths=_SUMMARY_FIELDS)
+        data = _unchanged_history(project_id, user_id, summary) if summary.exists else None
+        if summary.exists and data is None:
+            summary_data = summary.to_dict()
+            data = _compose_history(summary_data, await read_recent())
+            legacy = summary_data.get("interactions")
+    else:
+        # Both reads at once - a new user just gets an empty query back
+        summary, recent = await asyncio.gather(
+            summary_ref.get(field_paths=_SUMMARY_FIELDS),
+            read_recent(),
+        )
+        data = None
+        if summary.exists:
+            summary_data = summary.to_dict()
+            data = _compose_history(summary_data, recent)
+            legacy = summary_data.get("interactions")
+    
+    if legacy:
+        await _migrate_legacy_interactions_async(db, user_id, legacy)
+    
+    _cache_history_doc(project_id, user_id, data, summary.update_time if data else None)
+    return data
+
 
+def _has_known_version(project_id: str, user_id: str) -> bool:
+    with _history_cache_lock:
+        return (project_id, user_id) in _history_versions
 
-def _get_firestore_client(project_id: str) -> firestore.Client:
-    """Get or create Firestore client."""
-    global _firestore_client
-    if _firestore_client is None:
-        _firestore_client = firestore.Client(project=project_id)
-        logger.info(f"Initialized Firestore client for project: {project_id}")
-    return _firestore_client
+
+def _is_versioned(project_id: str, user_id: str, data: Any) -> bool:
+    """Whether data is the history as of the summary's last known update_time."""
+    with _history_cache_lock:
+        version = _history_versions.get((project_id, user_id))
+    return version is not None and version[1] is data
+
+
+def _unchanged_history(project_id: str, user_id: str, summary) -> Optional[dict]:
+    """The previously read history if the summary hasn't been written since, else None."""
+    with _history_cache_lock:
+        version = _history_versions.get((project_id, user_id))
+    if version is not None and version[0] == summary.update_time:
+        return version[1]
+    return None
+
+
+def _recent_interactions_query(db, user_id: str):
+    """Query for the user's most recent interactions, newest first."""
+    from google.cloud import firestore  # Deferred to first use - slow to import
+    return (
+        db.collection(COLLECTION_NAME)
+        .document(user_id)
+        .collection(INTERACTIONS_COLLECTION)
+        .order_by("timestamp", direction=firestore.Query.DESCENDING)
+        .limit(MAX_RECENT_INTERACTIONS)
+    )
+
+
+def _expire_at(timestamp: Optional[str] = None) -> datetime:
+    """When an interaction saved at timestamp (ISO, default now) is deleted by TTL."""
+    try:
+        saved = datetime.fromisoformat(timestamp) if timestamp else None
+    except (TypeError, ValueError):
+        saved = None
+    return (saved or datetime.now(timezone.utc)) + _RETENTION
+
+
+def _legacy_migration_batch(db, user_id: str, legacy: List[dict]):
+    """
+    Batch moving a legacy inline "interactions" array into the subcollection.
+
+    Records get fixed ids by position, so a migration repeated by a
+    concurrent reader rewrites the same documents instead of duplicating them.
+    """
+    from google.cloud import firestore  # Deferred to first use - slow to import
+    summary_ref = db.collection(COLLECTION_NAME).document(user_id)
+    interactions_ref = summary_ref.collection(INTERACTIONS_COLLECTION)
+    batch = db.batch()
+    for position, interaction in enumerate(legacy):
+        batch.set(
+            interactions_ref.document(f"legacy-{position:03d}"),
+            {**interaction, "expire_at": _expire_at(interaction.get("timestamp"))},
+        )
+    batch.update(summary_ref, {"interactions": firestore.DELETE_FIELD})
+    return batch
+
+
+def _migrate_legacy_interactions(db, user_id: str, legacy: List[dict]) -> None:
+    """Migrate a legacy history array (best effort - retried on the next read)."""
+    try:
+        _legacy_migration_batch(db, user_id, legacy).commit()
+        logger.info(f"Migrated {len(legacy)} legacy interactions for user {user_id}")
+    except Exception as e:
+        logger.warning(f"Legacy interaction migration failed for user {user_id}: {e}")
+
+
+async def _migrate_legacy_interactions_async(db, user_id: str, legacy: List[dict]) -> None:
+    """Async version of _migrate_legacy_interactions."""
+    try:
+        await _legacy_migration_batch(db, user_id, legacy).commit()
+        logger.info(f"Migrated {len(legacy)} legacy interactions for user {user_id}")
+    except Exception as e:
+        logger.warning(f"Legacy interaction migration failed for user {user_id}: {e}")
+
+
+def _compose_history(summary: dict, recent: List[dict]) -> dict:
+    """
+    Combine a summary document and its recent interactions (newest first)
+    into the cached history shape, with interactions oldest first.
+    """
+    for interaction in recent:
+        interaction.pop("expire_at", None)  # Storage detail, not history
+    # A legacy inline array is older than every subcollection record
+    interactions = summary.get("interactions", []) + recent[::-1]
+    return {
+        "interactions": interactions[-MAX_RECENT_INTERACTIONS:],
+        "unresolved_issues": summary.get("unresolved_issues", []),
+        "total_interactions": summary.get("total_interactions", len(interactions)),
+        "sentiment_trend": summary.get("sentiment_trend"),
+        "sentiment_trend_total": summary.get("sentiment_trend_total"),
+    }
+
+
+def _peek_history_doc(project_id: str, user_id: str) -> Any:
+    """Cached history, None if known absent, _MISS if not cached."""
+    with _history_cache_lock:
+        return _history_cache.get((project_id, user_id), _MISS)
+
+
+def _cache_history_doc(
+    project_id: str,
+    user_id: str,
+    data: Optional[dict],
+    update_time: Any = None
+) -> None:
+    """
+    Store the history as read or just written, so the next read is a cache
+    hit - and, given the summary's update_time, remember it as a version.
+    """
+    key = (project_id, user_id)
+    with _history_cache_lock:
+        _history_cache[key] = data
+        if update_time is not None:
+            _history_versions[key] = (update_time, data)
+        else:
+            _history_versions.pop(key, None)
+
+
+def _apply_interaction(
+    data: Optional[dict],
+    interaction: dict,
+    topic: str,
+    resolution_status: str
+) -> dict:
+    """Mirror save_conversation's server-side update on cached history."""
+    data = dict(data or {})
+    data["interactions"] = (data.get("interactions", []) + [interaction])[-MAX_RECENT_INTERACTIONS:]
+    data["total_interactions"] = data.get("total_interactions", 0) + 1
+    data["sentiment_trend"] = _calculate_sentiment_trend(data["interactions"])
+    data["sentiment_trend_total"] = data["total_interactions"]
+    
+    unresolved = list(data.get("unresolved_issues", []))
+    if resolution_status == "pending" and topic not in unresolved:
+        unresolved.append(topic)
+    elif resolution_status == "resolved":
+        unresolved = [issue for issue in unresolved if issue != topic]
+    data["unresolved_issues"] = unresolved
+    return data
+
+
+def _build_history_result(data: Optional[dict], user_id: str, limit: int) -> dict:
+    """Build the fetch_conversation_history result from cached history."""
+    if data is None:
+        logger.info(f"No conversation history for user: {user_id}")
+        return {
+            "success": True,
+            "has_history": False,
+            "total_calls": 0,
+            "last_interactions": [],
+            "last_topic": None,
+            "unresolved_issues": [],
+            "sentiment_trend": "unknown",
+            "last_interaction_date": None,
+            "summary": f"No previous interaction history found for {user_id}. This appears to be a new user or their first call."
+        }
+    
+    interactions = data.get("interactions", [])
+    total_calls = data.get("total_interactions", len(interactions))
+    
+    # Get last N interactions, most recent first, in one slice (a copy,
+    # so the cached history is never mutated)
+    recent = interactions[:-limit - 1:-1]
+    
+    # Sentiment trend is computed at write time, stamped with the interaction
+    # count it covers - recompute it if any save since didn't update it
+    sentiment_trend = data.get("sentiment_trend")
+    if not sentiment_trend or data.get("sentiment_trend_total") != total_calls:
+        sentiment_trend = _calculate_sentiment_trend(interactions)
+    
+    # Get unresolved issues
+    unresolved = data.get("unresolved_issues", [])
+    
+    # Get last topic
+    last_topic = recent[0].get("topic") if recent else None
+    last_date = recent[0].get("timestamp") if recent else None
+    
+    logger.info(
+        f"Found {total_calls} total interactions for {user_id}. "
+        f"Sentiment trend: {sentiment_trend}"
+    )
+    
+    # Build summary
+    summary_parts = []
+    if total_calls > 0:
+        summary_parts.append(f"User has {total_calls} previous interaction(s).")
+    if last_topic:
+        summary_parts.append(f"Last discussed: {last_topic}.")
+    if unresolved:
+        summary_parts.append(f"Unresolved issues: {', '.join(unresolved)}.")
+    if sentiment_trend == "declining":
+        summary_parts.append("Sentiment has been declining - handle with care.")
+    
+    return {
+        "success": True,
+        "has_history": True,
+        "total_calls": total_calls,
+        "last_interactions": recent,
+        "last_topic": last_topic,
+        "unresolved_issues": unresolved,
+        "sentiment_trend": sentiment_trend,
+        "last_interaction_date": last_date,
+        "summary": " ".join(summary_parts) if summary_parts else "Returning user."
+    }
 
 
 def fetch_conversation_history(
@@ -69,68 +414,33 @@ def fetch_conversation_history(
         )
     """
     try:
-        db = _get_firestore_client(project_id)
-        doc_ref = db.collection(COLLECTION_NAME).document(user_id)
-        doc = doc_ref.get()
-        
-        if not doc.exists:
-            logger.info(f"No conversation history for user: {user_id}")
-            return {
-                "success": True,
-                "has_history": False,
-                "total_calls": 0,
-                "last_interactions": [],
-                "last_topic": None,
-                "unresolved_issues": [],
-                "sentiment_trend": "unknown",
-                "last_interaction_date": None,
-                "summary": f"No previous interaction history found for {user_id}. This appears to be a new user or their first call."
-            }
-        
-        data = doc.to_dict()
-        interactions = data.get("interactions", [])
-        
-        # Get last N interactions (most recent first)
-        recent = interactions[-limit:] if len(interactions) > limit else interactions
-        recent.reverse()  # Most recent first
+        data = _get_history_doc(project_id, user_id)
         
-        # Calculate sentiment trend
-        sentiment_trend = _calculate_sentiment_trend(interactions)
-        
-        # Get unresolved issues
-        unresolved = data.get("unresolved_issues", [])
-        
-        # Get last topic
-        last_topic = recent[0].get("topic") if recent else None
-        last_date = recent[0].get("timestamp") if recent else None
-        
-        logger.info(
-            f"Found {len(interactions)} total interactions for {user_id}. "
-            f"Sentiment trend: {sentiment_trend}"
-        )
-        
-        # Build summary
-        summary_parts = []
-        if len(interactions) > 0:
-            summary_parts.append(f"User has {len(interactions)} previous interaction(s).")
-        if last_topic:
-            summary_parts.append(f"Last discussed: {last_topic}.")
-        if unresolved:
-            summary_parts.append(f"Unresolved issues: {', '.join(unresolved)}.")
-        if sentiment_trend == "declining":
-            summary_parts.append("Sentiment has been declining - handle with care.")
+        return _build_history_result(data, user_id, limit)
         
+    except Exception as e:
+        logger.error(f"Error fetching conversation history: {e}", exc_info=True)
         return {
-            "success": True,
-            "has_history": True,
-            "total_calls": len(interactions),
-            "last_interactions": recent,
-            "last_topic": last_topic,
-            "unresolved_issues": unresolved,
-            "sentiment_trend": sentiment_trend,
-            "last_interaction_date": last_date,
-            "summary": " ".join(summary_parts) if summary_parts else "Returning user."
+            "success": False,
+            "has_history": False,
+            "error": f"Failed to fetch history: {str(e)}"
         }
+
+
+async def fetch_conversation_history_async(
+    project_id: str,
+    user_id: str,
+    limit: int = 10
+) -> dict:
+    """
+    Async version of fetch_conversation_history using the async client.
+    
+    Lets agents overlap the history read with other lookups instead of
+    tying up a worker thread per call.
+    """
+    try:
+        data = await _get_history_doc_async(project_id, user_id)
+        return _build_history_result(data, user_id, limit)
         
     except Exception as e:
         logger.error(f"Error fetching conversation history: {e}", exc_info=True)
@@ -141,6 +451,153 @@ def fetch_conversation_history(
         }
 
 
+def _build_interaction(
+    session_id: str,
+    query: str,
+    response: str,
+    topic: str,
+    sentiment: str,
+    was_escalated: bool,
+    escalation_reason: Optional[str],
+    resolution_status: str,
+    metadata: Optional[Dict[str, Any]]
+) -> dict:
+    """Create the interaction record stored by save_conversation."""
+    interaction = {
+        "timestamp": datetime.now(timezone.utc).isoformat(),
+        "session_id": session_id,
+        "query": query[:500],  # Truncate long queries
+        "response": response[:1000],  # Truncate long responses
+        "topic": topic,
+        "sentiment": sentiment,
+        "was_escalated": was_escalated,
+        "escalation_reason": escalation_reason,
+        "resolution_status": resolution_status,
+    }
+    
+    if metadata:
+        interaction["metadata"] = metadata
+    return interaction
+
+
+def _build_save_update(
+    firestore,
+    user_id: str,
+    interaction: dict,
+    topic: str,
+    resolution_status: str,
+    cached: Any,
+    versioned: Optional[dict]
+) -> dict:
+    """
+    Build the summary document merge update for a new interaction.
+
+    versioned is the cached history with the interaction applied, if the
+    cache held the history as read from Firestore (versioned by the summary's
+    update_time) rather than a locally applied save - only then is the new sentiment trend written, stamped with the total it
+    covers. Otherwise the stored trend is left alone: another instance's
+    save (or this one) makes the stamp stale, and readers recompute it.
+    """
+    update = {
+        "user_id": user_id,
+        "last_topic": topic,
+        "last_interaction_date": interaction["timestamp"],
+        "last_updated": firestore.SERVER_TIMESTAMP,
+        "total_interactions": firestore.Increment(1),
+    }
+    if resolution_status == "pending":
+        update["unresolved_issues"] = firestore.ArrayUnion([topic])
+    elif resolution_status == "resolved":
+        update["unresolved_issues"] = firestore.ArrayRemove([topic])
+    
+    if versioned is not None:
+        update["sentiment_trend"] = versioned["sentiment_trend"]
+        update["sentiment_trend_total"] = versioned["sentiment_trend_total"]
+    
+    if cached is None:
+        # Known to be the user's first conversation (if not known either
+        # way, _commit_save adds created_at when it has to create the document)
+        update["created_at"] = firestore.SERVER_TIMESTAMP
+    return update
+
+
+def _build_save_batch(db, user_id: str, interaction: dict, update: dict, write: str = "merge"):
+    """
+    Batch the new interaction record and the summary write into one commit.
+
+    write is how the summary is written: "merge" (set with merge), "update"
+    (fails with NotFound if there is no summary) or "create" (fails with
+    AlreadyExists if there is one). The batch is atomic, so a failed
+    attempt writes nothing.
+    """
+    summary_ref = db.collection(COLLECTION_NAME).document(user_id)
+    batch = db.batch()
+    batch.set(
+        summary_ref.collection(INTERACTIONS_COLLECTION).document(),
+        {**interaction, "expire_at": _expire_at(interaction["timestamp"])},
+    )
+    if write == "update":
+        batch.update(summary_ref, update)
+    elif write == "create":
+        batch.create(summary_ref, update)
+    else:
+        batch.set(summary_ref, update, merge=True)
+    return batch
+
+
+def _commit_save(
+    firestore,
+    db,
+    user_id: str,
+    interaction: dict,
+    update: dict,
+    cached: Any
+) -> list:
+    """
+    Commit a save and return its write results (results[1] is the summary).
+
+    If the cache doesn't know whether the user has a summary yet, update it
+    if it exists, else create it with created_at - one RPC for existing
+    users, and never a summary without its interaction.
+    """
+    from google.api_core.exceptions import AlreadyExists, NotFound
+    if cached is not _MISS:
+        return _build_save_batch(db, user_id, interaction, update).commit()
+    try:
+        return _build_save_batch(db, user_id, interaction, update, "update").commit()
+    except NotFound:
+        pass
+    created = {**update, "created_at": firestore.SERVER_TIMESTAMP}
+    try:
+        return _build_save_batch(db, user_id, interaction, created, "create").commit()
+    except AlreadyExists:
+        # Created by a concurrent save in the meantime
+        return _build_save_batch(db, user_id, interaction, update, "update").commit()
+
+
+async def _commit_save_async(
+    firestore,
+    db,
+    user_id: str,
+    interaction: dict,
+    update: dict,
+    cached: Any
+) -> list:
+    """Async version of _commit_save."""
+    from google.api_core.exceptions import AlreadyExists, NotFound
+    if cached is not _MISS:
+        return await _build_save_batch(db, user_id, interaction, update).commit()
+    try:
+        return await _build_save_batch(db, user_id, interaction, update, "update").commit()
+    except NotFound:
+        pass
+    created = {**update, "created_at": firestore.SERVER_TIMESTAMP}
+    try:
+        return await _build_save_batch(db, user_id, interaction, created, "create").commit()
+    except AlreadyExists:
+        return await _build_save_batch(db, user_id, interaction, update, "update").commit()
+
+
 def save_conversation(
     project_id: str,
     user_id: str,
@@ -187,62 +644,81 @@ def save_conversation(
             resolution_status="resolved"
         )
     """
+    from google.cloud import firestore  # Deferred to first use - slow to import
     try:
         db = _get_firestore_client(project_id)
-        doc_ref = db.collection(COLLECTION_NAME).document(user_id)
         
-        # Create interaction record
-        interaction = {
-            "timestamp": datetime.now(timezone.utc).isoformat(),
-            "session_id": session_id,
-            "query": query[:500],  # Truncate long queries
-            "response": response[:1000],  # Truncate long responses
-            "topic": topic,
-            "sentiment": sentiment,
-            "was_escalated": was_escalated,
-            "escalation_reason": escalation_reason,
-            "resolution_status": resolution_status,
+        interaction = _build_interaction(
+            session_id, query, response, topic, sentiment,
+            was_escalated, escalation_reason, resolution_status, metadata
+        )
+        cached = _peek_history_doc(project_id, user_id)
+        updated = None
+        if cached is not _MISS:
+            updated = _apply_interaction(cached, interaction, topic, resolution_status)
+        versioned = updated if _is_versioned(project_id, user_id, cached) else None
+        update = _build_save_update(
+            firestore, user_id, interaction, topic, resolution_status, cached, versioned
+        )
+        
+        # Single blind commit - one small record plus summary counters, no read needed
+        _commit_save(firestore, db, user_id, interaction, update, cached)
+        
+        if updated is not None:
+            # Unversioned - the merge was blind, so other writers' turns may be
+            # missing from updated; the next read after the short TTL re-fetches
+            _cache_history_doc(project_id, user_id, updated)
+        
+        logger.info(f"Saved conversation for user {user_id}, topic: {topic}")
+        
+        return {
+            "success": True,
+            "message": f"Conversation saved for {user_id}"
         }
         
-        if metadata:
-            interaction["metadata"] = metadata
+    except Exception as e:
+        logger.error(f"Error saving conversation: {e}", exc_info=True)
+        return {
+            "success": False,
+            "error": f"Failed to save conversation: {str(e)}"
+        }
+
+
+async def save_conversation_async(
+    project_id: str,
+    user_id: str,
+    session_id: str,
+    query: str,
+    response: str,
+    topic: str,
+    sentiment: str,
+    was_escalated: bool = False,
+    escalation_reason: Optional[str] = None,
+    resolution_status: str = "resolved",
+    metadata: Optional[Dict[str, Any]] = None
+) -> dict:
+    """Async version of save_conversation using the async client."""
+    from google.cloud import firestore  # Deferred to first use - slow to import
+    try:
+        db = _get_async_firestore_client(project_id)
         
-        # Get existing doc or create new
-        doc = doc_ref.get()
+        interaction = _build_interaction(
+            session_id, query, response, topic, sentiment,
+            was_escalated, escalation_reason, resolution_status, metadata
+        )
+        cached = _peek_history_doc(project_id, user_id)
+        updated = None
+        if cached is not _MISS:
+            updated = _apply_interaction(cached, interaction, topic, resolution_status)
+        versioned = updated if _is_versioned(project_id, user_id, cached) else None
+        update = _build_save_update(
+            firestore, user_id, interaction, topic, resolution_status, cached, versioned
+        )
         
-        if doc.exists:
-            data = doc.to_dict()
-            interactions = data.get("interactions", [])
-            interactions.append(interaction)
-            
-            # Trim to max size
-            if len(interactions) > MAX_STORED_INTERACTIONS:
-                interactions = interactions[-MAX_STORED_INTERACTIONS:]
-            
-            # Update unresolved issues
-            unresolved = data.get("unresolved_issues", [])
-            if resolution_status == "pending" and topic not in unresolved:
-                unresolved.append(topic)
-            elif resolution_status == "resolved" and topic in unresolved:
-                unresolved.remove(topic)
-            
-            doc_ref.update({
-                "interactions": interactions,
-                "unresolved_issues": unresolved,
-                "last_updated": datetime.now(timezone.utc).isoformat(),
-                "total_interactions": len(interactions),
-            })
-        else:
-            # Create new document
-            unresolved = [topic] if resolution_status == "pending" else []
-            doc_ref.set({
-                "user_id": user_id,
-                "created_at": datetime.now(timezone.utc).isoformat(),
-                "last_updated": datetime.now(timezone.utc).isoformat(),
-                "interactions": [interaction],
-                "unresolved_issues": unresolved,
-                "total_interactions": 1,
-            })
+        await _commit_save_async(firestore, db, user_id, interaction, update, cached)
+        
+        if updated is not None:
+            _cache_history_doc(project_id, user_id, updated)
         
         logger.info(f"Saved conversation for user {user_id}, topic: {topic}")
         
@@ -260,39 +736,59 @@ def save_conversation(
 
 
 def _calculate_sentiment_trend(interactions: List[dict]) -> str:
-    """Calculate sentiment trend from recent interactions."""
-    if len(interactions) < 2:
+    """Calculate sentiment trend from the last 5 interactions (single pass)."""
+    n = min(5, len(interactions))
+    if n < 2:
         return "unknown"
+    if n < 3:
+        return "stable"
     
-    # Get last 5 sentiments
-    recent_sentiments = [
-        i.get("sentiment", "neutral") 
-        for i in interactions[-5:]
-    ]
-    
-    # Score sentiments
-    scores = {
-        "positive": 2,
-        "neutral": 1,
-        "negative": -1,
-        "frustrated": -2
-    }
-    
-    # Calculate trend
-    recent_scores = [scores.get(s, 0) for s in recent_sentiments]
-    
-    if len(recent_scores) >= 3:
-        first_half = sum(recent_scores[:len(recent_scores)//2])
-        second_half = sum(recent_scores[len(recent_scores)//2:])
-        
-        if second_half > first_half + 1:
-            return "improving"
-        elif second_half < first_half - 1:
-            return "declining"
+    # Compare the score sums of the older and newer halves
+    half = n // 2
+    first_half = second_half = 0
+    for idx, interaction in enumerate(interactions[-n:]):
+        score = _SENTIMENT_SCORES.get(interaction.get("sentiment", "neutral"), 0)
+        if idx < half:
+            first_half += score
+        else:
+            second_half += score
     
+    if second_half > first_half + 1:
+        return "improving"
+    elif second_half < first_half - 1:
+        return "declining"
     return "stable"
 
 
+def _build_handoff(
+    user_id: str,
+    history: dict,
+    user: dict,
+    current_session_summary: Optional[str]
+) -> dict:
+    """Assemble the handoff screen data from history and user lookups."""
+    return {
+        "user_id": user_id,
+        "user_name": user.get("name") if user.get("success") else "Unknown",
+        "user_tier": user.get("tier") if user.get("success") else "Unknown",
+        
+        # Conversation context
+        "total_previous_calls": history.get("total_calls", 0),
+        "sentiment_trend": history.get("sentiment_trend", "unknown"),
+        "unresolved_issues": history.get("unresolved_issues", []),
+        "last_topic": history.get("last_topic"),
+        
+        # Current session
+        "current_session_summary": current_session_summary,
+        
+        # Recent history for agent to review
+        "recent_interactions": history.get("last_interactions", [])[:5],
+        
+        # Recommendations for agent
+        "agent_notes": _generate_agent_notes(history, user)
+    }
+
+
 def get_agent_handoff_context(
     project_id: str,
     user_id: str,
@@ -313,37 +809,42 @@ def get_agent_handoff_context(
         dict with all context needed for agent handoff screen
     """
     try:
-        # Fetch full history
-        history = fetch_conversation_history(project_id, user_id, limit=10)
+        # Independent lookups - run them side by side
+        history_future = _io_pool.submit(fetch_conversation_history, project_id, user_id, 10)
+        user_future = _io_pool.submit(fetch_user, project_id, user_id)
+        history = history_future.result()
+        user = user_future.result()
         
-        # Fetch user data
-        from app.tools.fetch_customer import fetch_customer
-        user = fetch_customer(project_id, customer_id=user_id)
+        handoff = _build_handoff(user_id, history, user, current_session_summary)
         
-        handoff = {
-            "user_id": user_id,
-            "user_name": user.get("name") if user.get("success") else "Unknown",
-            "user_tier": user.get("tier") if user.get("success") else "Unknown",
-            
-            # Conversation context
-            "total_previous_calls": history.get("total_calls", 0),
-            "sentiment_trend": history.get("sentiment_trend", "unknown"),
-            "unresolved_issues": history.get("unresolved_issues", []),
-            "last_topic": history.get("last_topic"),
-            
-            # Current session
-            "current_session_summary": current_session_summary,
-            
-            # Recent history for agent to review
-            "recent_interactions": history.get("last_interactions", [])[:5],
-            
-            # Recommendations for agent
-            "agent_notes": _generate_agent_notes(history, user)
+        return {
+            "success": True,
+            "handoff_context": handoff
         }
         
+    except Exception as e:
+        logger.error(f"Error getting handoff context: {e}", exc_info=True)
+        return {
+            "success": False,
+            "error": str(e)
+        }
+
+
+async def get_agent_handoff_context_async(
+    project_id: str,
+    user_id: str,
+    current_session_summary: Optional[str] = None
+) -> dict:
+    """Async version of get_agent_handoff_context - both lookups run concurrently."""
+    try:
+        history, user = await asyncio.gather(
+            fetch_conversation_history_async(project_id, user_id, limit=10),
+            fetch_user_async(project_id, user_id=user_id),
+        )
+        
         return {
             "success": True,
-            "handoff_context": handoff
+            "handoff_context": _build_handoff(user_id, history, user, current_session_summary)
         }
         
     except Exception as e:
@@ -357,17 +858,19 @@ def get_agent_handoff_context(
 def _generate_agent_notes(history: dict, user: dict) -> List[str]:
     """Generate helpful notes for human agent."""
     notes = []
+    total_calls = history.get("total_calls", 0)
+    unresolved = history.get("unresolved_issues")
     
     if history.get("sentiment_trend") == "declining":
         notes.append("⚠️ User sentiment declining - approach with empathy")
     
-    if history.get("total_calls", 0) > 3:
-        notes.append(f"📞 Frequent caller ({history.get('total_calls')} calls) - consider VIP handling")
+    if total_calls > 3:
+        notes.append(f"📞 Frequent caller ({total_calls} calls) - consider VIP handling")
     
-    if history.get("unresolved_issues"):
-        notes.append(f"🔴 Has unresolved issues: {', '.join(history.get('unresolved_issues'))}")
+    if unresolved:
+        notes.append(f"🔴 Has unresolved issues: {', '.join(unresolved)}")
     
     if user.get("tier") == "Premium":
         notes.append("⭐ Premium tier user")
     
-    return notes
\ No newline at end of file
+    return notes
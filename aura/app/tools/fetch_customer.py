@@ -6,22 +6,40 @@ ADK automatically converts functions to tools - no base class needed!
 Reference: https://google.github.io/adk-docs/tools/
 """
 
-from google.cloud import firestore
 import logging
+import time
 from typing import Optional
 
+from app.tools._clients import (
+    get_async_firestore as _get_async_firestore_client,
+    get_firestore as _get_firestore_client,
+)
+
 logger = logging.getLogger(__name__)
 
-# Initialize Firestore client globally
-_firestore_client = None
 
-def _get_firestore_client(project_id: str) -> firestore.Client:
-    """Get or create Firestore client"""
-    global _firestore_client
-    if _firestore_client is None:
-        _firestore_client = firestore.Client(project=project_id)
-        logger.info(f"Initialized Firestore client for project: {project_id}")
-    return _firestore_client
+async def warm_clients(project_id: str) -> None:
+    """Create the async client and open its channel before the first request."""
+    started = time.perf_counter()
+    db = _get_async_firestore_client(project_id)
+    async for _ in db.collection('users').limit(1).stream():
+        pass
+    logger.info(f"User lookup client warmed in {(time.perf_counter() - started) * 1000:.0f} ms")
+
+
+def _build_user_result(user_id: str, doc) -> dict:
+    """Build the fetch_user result from a user document snapshot."""
+    if doc.exists:
+        data = doc.to_dict()
+        logger.info(f"Found user: {data.get('name')}")
+        # One flat payload - the profile fields plus the lookup status
+        return {"success": True, **data, "user_id": user_id}
+    else:
+        logger.warning(f"User not found: {user_id}")
+        return {
+            "success": False,
+            "error": f"User {user_id} not found in database"
+        }
 
 
 def fetch_user(
@@ -51,23 +69,36 @@ def fetch_user(
         if user_id:
             logger.info(f"Fetching user by ID: {user_id}")
             doc = db.collection('users').document(user_id).get()
+            return _build_user_result(user_id, doc)
+
+        return {
+            "success": False,
+            "error": "Must provide user_id"
+        }
+
+    except Exception as e:
+        logger.error(f"Error fetching user: {e}", exc_info=True)
+        return {
+            "success": False,
+            "error": f"Database error: {str(e)}"
+        }
+
+
+# Older name for the same tool, kept for existing imports
+fetch_customer = fetch_user
+
 
-            if doc.exists:
-                data = doc.to_dict()
-                logger.info(f"Found user: {data.get('name')}")
-                return {
-                    "success": True,
-                    "user": data,
-                    "user_id": user_id,
-                    "name": data.get('name'),
-                    "tier": data.get('tier')
-                }
-            else:
-                logger.warning(f"User not found: {user_id}")
-                return {
-                    "success": False,
-                    "error": f"User {user_id} not found in database"
-                }
+async def fetch_user_async(
+    project_id: str,
+    user_id: Optional[str] = None
+) -> dict:
+    """Async version of fetch_user using the async client."""
+    try:
+        if user_id:
+            logger.info(f"Fetching user by ID: {user_id}")
+            db = _get_async_firestore_client(project_id)
+            doc = await db.collection('users').document(user_id).get()
+            return _build_user_result(user_id, doc)
 
         return {
             "success": False,
@@ -79,4 +110,4 @@ def fetch_user(
         return {
             "success": False,
             "error": f"Database error: {str(e)}"
-        }
\ No newline at end of file
+        }
@@ -5,22 +5,48 @@ Simple function tool that fetches tier limits from a database
 ADK automatically converts functions to tools!
 """
 
-from google.cloud import bigquery
+import asyncio
 import logging
+import threading
+import time
 from typing import Optional, List
 
+from cachetools import TTLCache
+
+from app.tools._clients import get_bigquery as _get_bigquery_client
+
 logger = logging.getLogger(__name__)
 
-# Initialize BigQuery client globally
-_bigquery_client = None
+# Columns the agents use - BigQuery bills by columns scanned, so never SELECT *
+_LIMITS_COLUMNS = ", ".join((
+    "tier_name",
+    "tier_description",
+    "annual_fee_from",
+    "item_1_max",
+    "item_2_max",
+    "single_item_limit",
+    "excess_standard",
+    "excess_extra",
+    "extra_limit",
+    "other_limit",
+))
+
+# Tier limits are reference data - cache successful lookups for 10 minutes
+_limits_cache: TTLCache = TTLCache(maxsize=32, ttl=600)
+_limits_cache_lock = threading.Lock()  # Tools run in worker threads
+
+
+def invalidate_limits_cache() -> None:
+    """Drop cached limits, e.g. after the limits table was updated."""
+    with _limits_cache_lock:
+        _limits_cache.clear()
 
-def _get_bigquery_client(project_id: str) -> bigquery.Client:
-    """Get or create BigQuery client"""
-    global _bigquery_client
-    if _bigquery_client is None:
-        _bigquery_client = bigquery.Client(project=project_id)
-        logger.info(f"Initialized BigQuery client for project: {project_id}")
-    return _bigquery_client
+
+def warm_client(project_id: str) -> None:
+    """Create the BigQuery client (auth + transport) before the first request."""
+    started = time.perf_counter()
+    _get_bigquery_client(project_id)
+    logger.info(f"Limits client warmed in {(time.perf_counter() - started) * 1000:.0f} ms")
 
 
 def fetch_limits(
@@ -45,6 +71,29 @@ def fetch_limits(
         fetch_limits(project_id="my-project", tier_name="Premium")
         fetch_limits(project_id="my-project")  # Returns all tiers
     """
+    key = (project_id, tier_name)
+    with _limits_cache_lock:
+        cached = _limits_cache.get(key)
+    if cached is not None:
+        return cached
+    
+    result = _query_limits(project_id, tier_name)
+    if result["success"]:
+        with _limits_cache_lock:
+            _limits_cache[key] = result
+            # The comparison already holds every tier's row - prefill single-tier lookups
+            for row in result.get("all_tiers", ()):
+                _limits_cache[(project_id, row["tier_name"])] = {
+                    "success": True,
+                    "tier": row["tier_name"],
+                    "limits": row
+                }
+    return result
+
+
+def _query_limits(project_id: str, tier_name: Optional[str]) -> dict:
+    """Run the fetch_limits query against BigQuery."""
+    from google.cloud import bigquery  # Deferred to first use - slow to import
     try:
         client = _get_bigquery_client(project_id)
 
@@ -53,7 +102,7 @@ def fetch_limits(
             logger.info(f"Fetching limits for tier: {tier_name}")
 
             query = f"""
-            SELECT *
+            SELECT {_LIMITS_COLUMNS}
             FROM `{project_id}.database.limits`
             WHERE tier_name = @tier_name
             """
@@ -85,17 +134,7 @@ def fetch_limits(
             logger.info("Fetching all tiers for comparison")
 
             query = f"""
-            SELECT 
-                tier_name,
-                tier_description,
-                annual_fee_from,
-                item_1_max,
-                item_2_max,
-                single_item_limit,
-                excess_standard,
-                excess_extra,
-                extra_limit,
-                other_limit
+            SELECT {_LIMITS_COLUMNS}
             FROM `{project_id}.database.limits`
             ORDER BY annual_fee_from
             """
@@ -121,4 +160,16 @@ def fetch_limits(
         return {
             "success": False,
             "error": f"Database error: {str(e)}"
-        }
\ No newline at end of file
+        }
+
+
+async def fetch_limits_async(
+    project_id: str,
+    tier_name: Optional[str] = None
+) -> dict:
+    """
+    Async version of fetch_limits.
+
+    BigQuery has no async client, so the query runs in a worker thread.
+    """
+    return await asyncio.to_thread(fetch_limits, project_id, tier_name)
@@ -3,12 +3,15 @@ Search Tool - Wraps VertexAiSearchTool for ADK
 """
 
 import logging
+from functools import lru_cache
+
 from google.adk.tools import VertexAiSearchTool
 from app.config import settings
 
 logger = logging.getLogger(__name__)
 
 
+@lru_cache(maxsize=1)
 def build_datastore_path() -> str:
     """
     Build the fully-qualified Vertex AI Search datastore path.
@@ -38,12 +41,14 @@ def build_datastore_path() -> str:
     return datastore_path
 
 
+@lru_cache(maxsize=1)
 def get_search_tool() -> VertexAiSearchTool:
     """
-    Factory function to create the Search tool.
+    Factory function to create the Search tool (once per process).
     
     This tool allows the RAG agent to search documents
-    using Vertex AI Search with grounding.
+    using Vertex AI Search with grounding. Settings are static,
+    so the path and the tool are built on first use and shared.
     
     Returns:
         VertexAiSearchTool configured for the datastore
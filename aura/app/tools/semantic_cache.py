@@ -0,0 +1,162 @@
+"""
+Semantic Cache - Reuse answers for repeat questions
+
+Customer-service traffic is highly repetitive ("what are your office hours",
+"is X covered"). Queries are embedded and compared by cosine similarity
+against previously answered queries of the same category; a close enough
+match returns the stored RAG answer (and generic response) instead of
+running the RAG pipeline again.
+
+Only guest-flow answers are stored - they contain no customer data, so they
+are safe to serve to any caller. Authenticated turns reuse the RAG answer
+and still run the personalized Response agent.
+
+The cache is in-process and optional: it needs SEMANTIC_CACHE_ENABLED and
+numpy, otherwise every lookup is a miss.
+"""
+
+import logging
+import threading
+from functools import lru_cache
+from typing import Dict, List, Optional, Tuple
+
+from cachetools import LRUCache
+
+from app.config import settings
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+logger = logging.getLogger(__name__)
+
+if settings.SEMANTIC_CACHE_ENABLED and np is None:
+    logger.warning("SEMANTIC_CACHE_ENABLED is set but numpy is not installed - semantic cache disabled")
+
+EMBEDDING_MODEL = "text-embedding-004"
+MAX_ENTRIES_PER_CATEGORY = 512
+
+# category -> (unit-norm embedding matrix, cached answers in row order)
+_entries: Dict[str, Tuple["np.ndarray", List[dict]]] = {}
+# Query embeddings - only successful ones, so a failed call is retried next time
+_embeddings: LRUCache = LRUCache(maxsize=1024)
+# Guards the entries, the embedding cache and the stats (lookups run in worker threads)
+_lock = threading.Lock()
+_stats = {"lookups": 0, "hits": 0}
+
+
+def _normalize(query: str) -> str:
+    return " ".join(query.lower().split())
+
+
+@lru_cache()
+def _get_client():
+    """Get cached GenAI client for embeddings."""
+    from google import genai
+    return genai.Client(
+        vertexai=True,
+        project=settings.GCP_PROJECT_ID,
+        location=settings.GOOGLE_CLOUD_LOCATION,
+    )
+
+
+def _embed(normalized_query: str) -> Optional["np.ndarray"]:
+    """Embed a normalized query as a unit vector (cached per query string)."""
+    with _lock:
+        vector = _embeddings.get(normalized_query)
+    if vector is not None:
+        return vector
+
+    try:
+        response = _get_client().models.embed_content(
+            model=EMBEDDING_MODEL,
+            contents=normalized_query,
+        )
+        vector = np.asarray(response.embeddings[0].values, dtype=np.float32)
+    except Exception as e:
+        logger.warning(f"Semantic cache embedding failed: {e}")
+        return None
+
+    norm = np.linalg.norm(vector)
+    if not norm:
+        return None
+    vector = vector / norm
+    with _lock:
+        _embeddings[normalized_query] = vector
+    return vector
+
+
+def is_enabled() -> bool:
+    return settings.SEMANTIC_CACHE_ENABLED and np is not None
+
+
+def lookup(query: str, category: str) -> Optional[dict]:
+    """
+    Find a cached answer for a semantically similar query.
+
+    Blocking (makes an embedding call) - run it with asyncio.to_thread.
+
+    Args:
+        query: The user's query
+        category: Guardrails category - only same-category answers match
+
+    Returns:
+        Dict with rag_answer and final_response, or None on miss
+    """
+    if not is_enabled() or not query:
+        return None
+
+    with _lock:
+        _stats["lookups"] += 1
+    query_vector = _embed(_normalize(query))
+    with _lock:
+        bucket = _entries.get(category)
+    if query_vector is None or bucket is None:
+        return None
+
+    matrix, answers = bucket
+    # Rows and query are unit vectors, so the dot product is the cosine
+    scores = matrix @ query_vector
+    best = int(scores.argmax())
+    if scores[best] < settings.SEMANTIC_CACHE_THRESHOLD:
+        return None
+
+    with _lock:
+        _stats["hits"] += 1
+    logger.info(
+        f"Semantic cache hit (score={scores[best]:.3f}, "
+        f"hit_rate={get_hit_rate():.1%})"
+    )
+    return answers[best]
+
+
+def store(query: str, category: str, rag_answer: str, final_response: str) -> None:
+    """
+    Cache the answer for a query. Blocking - run it with asyncio.to_thread.
+
+    The oldest entry of the category is evicted once it is full.
+    """
+    if not is_enabled() or not query or not rag_answer:
+        return
+
+    query_vector = _embed(_normalize(query))
+    if query_vector is None:
+        return
+
+    answer = {"rag_answer": rag_answer, "final_response": final_response}
+    with _lock:
+        matrix, answers = _entries.get(category, (None, []))
+        if matrix is None:
+            matrix = query_vector[np.newaxis, :]
+        else:
+            matrix = np.vstack([matrix[-(MAX_ENTRIES_PER_CATEGORY - 1):], query_vector])
+            answers = answers[-(MAX_ENTRIES_PER_CATEGORY - 1):]
+        _entries[category] = (matrix, answers + [answer])
+
+
+def get_hit_rate() -> float:
+    """Fraction of lookups served from the cache since startup."""
+    with _lock:
+        lookups, hits = _stats["lookups"], _stats["hits"]
+    return hits / lookups if lookups else 0.0
@@ -11,78 +11,153 @@ Stores:
 Table: {project}.adk_agent_analytics.conversation_telemetry
 """
 
-from google.cloud import bigquery
-from datetime import datetime, timezone
+from datetime import datetime, timedelta, timezone
+import asyncio
+import io
 import logging
-from typing import Optional, Dict, Any
+from functools import lru_cache
+from typing import TYPE_CHECKING, Optional, Dict, Any, List, Set
 import json
 
+import orjson
+
+from app.config import settings
+from app.tools._clients import get_bigquery as _get_bigquery_client
+
 logger = logging.getLogger(__name__)
 
-# Global BigQuery client
-_bigquery_client = None
+if TYPE_CHECKING:
+    from google.cloud import bigquery
 
 DATASET_ID = "adk_agent_analytics"
 TABLE_ID = "conversation_telemetry"
 
+# Telemetry table schema as (name, BigQuery type, mode) - shared by table
+# creation and the Storage Write API row encoding
+TELEMETRY_COLUMNS = [
+    ("timestamp", "TIMESTAMP", "REQUIRED"),
+    ("session_id", "STRING", "REQUIRED"),
+    ("user_id", "STRING", "NULLABLE"),
+    ("is_authenticated", "BOOLEAN", "REQUIRED"),
+    
+    # Classification
+    ("category", "STRING", "NULLABLE"),
+    ("sentiment", "STRING", "NULLABLE"),
+    ("topic", "STRING", "NULLABLE"),
+    
+    # Outcome
+    ("action_taken", "STRING", "NULLABLE"),
+    ("was_escalated", "BOOLEAN", "REQUIRED"),
+    ("escalation_reason", "STRING", "NULLABLE"),
+    ("resolution_status", "STRING", "NULLABLE"),
+    
+    # Timing (milliseconds)
+    ("total_latency_ms", "INTEGER", "NULLABLE"),
+    ("guardrails_latency_ms", "INTEGER", "NULLABLE"),
+    ("rag_latency_ms", "INTEGER", "NULLABLE"),
+    ("response_latency_ms", "INTEGER", "NULLABLE"),
+    
+    # Quality
+    ("confidence_score", "FLOAT", "NULLABLE"),
+    ("rag_sources_count", "INTEGER", "NULLABLE"),
+    
+    # Context
+    ("query_length", "INTEGER", "NULLABLE"),
+    ("response_length", "INTEGER", "NULLABLE"),
+    ("flow_type", "STRING", "NULLABLE"),  # "authenticated" or "guest"
+    
+    # Metadata (JSON string)
+    ("metadata", "STRING", "NULLABLE"),
+]
+
+_UTC = timezone.utc
+
+
+@lru_cache(maxsize=None)
+def _table_ref(project_id: str) -> str:
+    """Fully-qualified telemetry table ID (built once per project)."""
+    return f"{project_id}.{DATASET_ID}.{TABLE_ID}"
+
 
-def _get_bigquery_client(project_id: str) -> bigquery.Client:
-    """Get or create BigQuery client."""
-    global _bigquery_client
-    if _bigquery_client is None:
-        _bigquery_client = bigquery.Client(project=project_id)
-        logger.info(f"Initialized BigQuery client for project: {project_id}")
-    return _bigquery_client
+# Projects whose telemetry table is known to exist - create_table is an RPC,
+# so it runs once per process (at startup) instead of on every insert
+_tables_ready: Set[str] = set()
 
 
-def _ensure_table_exists(client: bigquery.Client, project_id: str):
-    """Create telemetry table if it doesn't exist."""
-    table_ref = f"{project_id}.{DATASET_ID}.{TABLE_ID}"
+def _ensure_table_exists(client: "bigquery.Client", project_id: str):
+    """Create telemetry table if it doesn't exist (once per project)."""
+    if project_id in _tables_ready:
+        return
+    from google.cloud import bigquery  # Deferred to first use - slow to import
+    table_ref = _table_ref(project_id)
     
     schema = [
-        bigquery.SchemaField("timestamp", "TIMESTAMP", mode="REQUIRED"),
-        bigquery.SchemaField("session_id", "STRING", mode="REQUIRED"),
-        bigquery.SchemaField("user_id", "STRING", mode="NULLABLE"),
-        bigquery.SchemaField("is_authenticated", "BOOLEAN", mode="REQUIRED"),
-        
-        # Classification
-        bigquery.SchemaField("category", "STRING", mode="NULLABLE"),
-        bigquery.SchemaField("sentiment", "STRING", mode="NULLABLE"),
-        bigquery.SchemaField("topic", "STRING", mode="NULLABLE"),
-        
-        # Outcome
-        bigquery.SchemaField("action_taken", "STRING", mode="NULLABLE"),
-        bigquery.SchemaField("was_escalated", "BOOLEAN", mode="REQUIRED"),
-        bigquery.SchemaField("escalation_reason", "STRING", mode="NULLABLE"),
-        bigquery.SchemaField("resolution_status", "STRING", mode="NULLABLE"),
-        
-        # Timing (milliseconds)
-        bigquery.SchemaField("total_latency_ms", "INTEGER", mode="NULLABLE"),
-        bigquery.SchemaField("guardrails_latency_ms", "INTEGER", mode="NULLABLE"),
-        bigquery.SchemaField("rag_latency_ms", "INTEGER", mode="NULLABLE"),
-        bigquery.SchemaField("response_latency_ms", "INTEGER", mode="NULLABLE"),
-        
-        # Quality
-        bigquery.SchemaField("confidence_score", "FLOAT", mode="NULLABLE"),
-        bigquery.SchemaField("rag_sources_count", "INTEGER", mode="NULLABLE"),
-        
-        # Context
-        bigquery.SchemaField("query_length", "INTEGER", mode="NULLABLE"),
-        bigquery.SchemaField("response_length", "INTEGER", mode="NULLABLE"),
-        bigquery.SchemaField("flow_type", "STRING", mode="NULLABLE"),  # "authenticated" or "guest"
-        
-        # Metadata (JSON string)
-        bigquery.SchemaField("metadata", "STRING", mode="NULLABLE"),
+        bigquery.SchemaField(name, field_type, mode=mode)
+        for name, field_type, mode in TELEMETRY_COLUMNS
     ]
     
     try:
         table = bigquery.Table(table_ref, schema=schema)
         table = client.create_table(table, exists_ok=True)
+        _tables_ready.add(project_id)
         logger.info(f"Telemetry table ready: {table_ref}")
     except Exception as e:
         logger.warning(f"Could not create table (may already exist): {e}")
 
 
+def ensure_telemetry_table(project_id: str) -> None:
+    """Create the telemetry table up front (blocking - call at startup)."""
+    _ensure_table_exists(_get_bigquery_client(project_id), project_id)
+
+
+def build_telemetry_row(
+    session_id: str,
+    user_id: Optional[str] = None,
+    is_authenticated: bool = False,
+    category: Optional[str] = None,
+    sentiment: Optional[str] = None,
+    topic: Optional[str] = None,
+    action_taken: Optional[str] = None,
+    was_escalated: bool = False,
+    escalation_reason: Optional[str] = None,
+    resolution_status: Optional[str] = None,
+    total_latency_ms: Optional[int] = None,
+    guardrails_latency_ms: Optional[int] = None,
+    rag_latency_ms: Optional[int] = None,
+    response_latency_ms: Optional[int] = None,
+    confidence_score: Optional[float] = None,
+    rag_sources_count: Optional[int] = None,
+    query_length: Optional[int] = None,
+    response_length: Optional[int] = None,
+    flow_type: Optional[str] = None,
+    metadata: Optional[Dict[str, Any]] = None
+) -> dict:
+    """Build a telemetry table row. See log_telemetry for the fields."""
+    return {
+        "timestamp": datetime.now(_UTC).isoformat(),
+        "session_id": session_id,
+        "user_id": user_id,
+        "is_authenticated": is_authenticated,
+        "category": category,
+        "sentiment": sentiment,
+        "topic": topic,
+        "action_taken": action_taken,
+        "was_escalated": was_escalated,
+        "escalation_reason": escalation_reason,
+        "resolution_status": resolution_status,
+        "total_latency_ms": total_latency_ms,
+        "guardrails_latency_ms": guardrails_latency_ms,
+        "rag_latency_ms": rag_latency_ms,
+        "response_latency_ms": response_latency_ms,
+        "confidence_score": confidence_score,
+        "rag_sources_count": rag_sources_count,
+        "query_length": query_length,
+        "response_length": response_length,
+        "flow_type": flow_type,
+        "metadata": json.dumps(metadata) if metadata else None,
+    }
+
+
 def log_telemetry(
     project_id: str,
     session_id: str,
@@ -114,6 +189,10 @@ def log_telemetry(
     - Quality metrics (confidence, sources)
     - Outcome metrics (escalation, resolution)
     
+    Rows are streamed without insert IDs (higher ingestion ceiling, no
+    per-row dedup), so delivery is at-least-once: a retried insert can
+    leave a duplicate row.
+    
     Args:
         project_id: GCP project ID
         session_id: Unique session identifier
@@ -160,33 +239,32 @@ def log_telemetry(
         # Ensure table exists
         _ensure_table_exists(client, project_id)
         
-        table_ref = f"{project_id}.{DATASET_ID}.{TABLE_ID}"
+        table_ref = _table_ref(project_id)
         
-        row = {
-            "timestamp": datetime.now(timezone.utc).isoformat(),
-            "session_id": session_id,
-            "user_id": user_id,
-            "is_authenticated": is_authenticated,
-            "category": category,
-            "sentiment": sentiment,
-            "topic": topic,
-            "action_taken": action_taken,
-            "was_escalated": was_escalated,
-            "escalation_reason": escalation_reason,
-            "resolution_status": resolution_status,
-            "total_latency_ms": total_latency_ms,
-            "guardrails_latency_ms": guardrails_latency_ms,
-            "rag_latency_ms": rag_latency_ms,
-            "response_latency_ms": response_latency_ms,
-            "confidence_score": confidence_score,
-            "rag_sources_count": rag_sources_count,
-            "query_length": query_length,
-            "response_length": response_length,
-            "flow_type": flow_type,
-            "metadata": json.dumps(metadata) if metadata else None,
-        }
+        row = build_telemetry_row(
+            session_id=session_id,
+            user_id=user_id,
+            is_authenticated=is_authenticated,
+            category=category,
+            sentiment=sentiment,
+            topic=topic,
+            action_taken=action_taken,
+            was_escalated=was_escalated,
+            escalation_reason=escalation_reason,
+            resolution_status=resolution_status,
+            total_latency_ms=total_latency_ms,
+            guardrails_latency_ms=guardrails_latency_ms,
+            rag_latency_ms=rag_latency_ms,
+            response_latency_ms=response_latency_ms,
+            confidence_score=confidence_score,
+            rag_sources_count=rag_sources_count,
+            query_length=query_length,
+            response_length=response_length,
+            flow_type=flow_type,
+            metadata=metadata,
+        )
         
-        errors = client.insert_rows_json(table_ref, [row])
+        errors = client.insert_rows_json(table_ref, [row], row_ids=[None])
         
         if errors:
             logger.error(f"BigQuery insert errors: {errors}")
@@ -209,6 +287,239 @@ def log_telemetry(
         }
 
 
+class TelemetryBatcher:
+    """
+    Buffers telemetry rows in memory and streams them to BigQuery in batches.
+    
+    One append per batch instead of one insert per conversation amortizes
+    the RPC overhead, and enqueueing is instant for the caller. Batches go
+    through the Storage Write API (protobuf over gRPC) when
+    TELEMETRY_STORAGE_WRITE is on and the client library is installed,
+    otherwise - and for any batch it fails - through insert_rows_json.
+    A batch is flushed every FLUSH_INTERVAL seconds or as soon as
+    BATCH_SIZE rows are waiting, whichever comes first. Delivery is
+    at-least-once, like log_telemetry.
+    """
+    
+    BATCH_SIZE = 500  # BigQuery's recommended rows per streaming insert
+    FLUSH_INTERVAL = 0.5  # Seconds
+    MAX_QUEUE_SIZE = 10000
+    
+    def __init__(self, project_id: str):
+        self.project_id = project_id
+        self.table_ref = _table_ref(project_id)
+        self._queue: Optional[asyncio.Queue] = None
+        self._task: Optional[asyncio.Task] = None
+        # Rows the flusher has taken off the queue: the batch still filling,
+        # and the write of the last full one - stop() finishes both
+        self._pending: List[dict] = []
+        self._inflight: Optional[asyncio.Future] = None
+        self._appender = None
+        self._appender_checked = False
+    
+    @property
+    def running(self) -> bool:
+        return self._task is not None and not self._task.done()
+    
+    def start(self) -> None:
+        """Start the background flusher on the running event loop."""
+        if self.running:
+            return
+        self._queue = asyncio.Queue(maxsize=self.MAX_QUEUE_SIZE)
+        self._task = asyncio.create_task(self._flush_loop())
+        logger.info("Telemetry batcher started")
+    
+    async def stop(self) -> None:
+        """Stop the flusher and write out any rows still queued."""
+        if not self.running:
+            return
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        
+        if self._inflight is not None and not self._inflight.done():
+            await self._inflight
+        pending, self._pending = self._pending, []
+        await self._flush(pending)
+        await self.flush()
+        if self._appender is not None:
+            await asyncio.to_thread(self._appender.close)
+        logger.info("Telemetry batcher stopped")
+    
+    async def flush(self) -> None:
+        """Write out every row queued so far, in batches."""
+        if self._queue is None:
+            return
+        while not self._queue.empty():
+            await self._flush(self._take_batch())
+    
+    def enqueue(self, row: dict) -> bool:
+        """
+        Queue a row built with build_telemetry_row().
+        
+        Returns:
+            False if the batcher isn't running or the queue is full
+            (caller should fall back to log_telemetry)
+        """
+        if not self.running:
+            return False
+        try:
+            self._queue.put_nowait(row)
+            return True
+        except asyncio.QueueFull:
+            logger.warning("Telemetry queue full - dropping to direct insert")
+            return False
+    
+    def _take_batch(self) -> List[dict]:
+        """Take up to BATCH_SIZE rows that are already queued."""
+        batch = []
+        while len(batch) < self.BATCH_SIZE and not self._queue.empty():
+            batch.append(self._queue.get_nowait())
+        return batch
+    
+    async def _flush_loop(self) -> None:
+        """Wait for a row, then give the batch up to FLUSH_INTERVAL to fill."""
+        loop = asyncio.get_running_loop()
+        while True:
+            # The filling batch lives on self, so stop() can flush it
+            self._pending.append(await self._queue.get())
+            deadline = loop.time() + self.FLUSH_INTERVAL
+            while len(self._pending) < self.BATCH_SIZE:
+                timeout = deadline - loop.time()
+                if timeout <= 0:
+                    break
+                try:
+                    self._pending.append(await asyncio.wait_for(self._queue.get(), timeout))
+                except asyncio.TimeoutError:
+                    break
+            batch, self._pending = self._pending, []
+            # Shielded - cancelling the loop mustn't abandon a batch mid-write
+            self._inflight = asyncio.ensure_future(self._flush(batch))
+            await asyncio.shield(self._inflight)
+    
+    async def _flush(self, rows: List[dict]) -> None:
+        """Insert one batch of rows, logging (not raising) failures."""
+        if not rows:
+            return
+        try:
+            errors = await asyncio.to_thread(self._insert, rows)
+            if errors:
+                logger.error(f"BigQuery batch insert errors: {errors}")
+            else:
+                logger.info(f"Telemetry batch logged: {len(rows)} rows")
+        except Exception as e:
+            logger.error(f"Error logging telemetry batch ({len(rows)} rows): {e}", exc_info=True)
+    
+    def _get_appender(self):
+        """Storage Write appender, created on first use (None = use insert_rows_json)."""
+        if not self._appender_checked:
+            self._appender_checked = True
+            if settings.TELEMETRY_STORAGE_WRITE:
+                try:
+                    from app.tools._storage_write import create_appender
+                    self._appender = create_appender(
+                        self.project_id, DATASET_ID, TABLE_ID, TELEMETRY_COLUMNS
+                    )
+                except ImportError as e:
+                    logger.warning(f"Storage Write API unavailable - using insert_rows_json: {e}")
+        return self._appender
+    
+    def _insert(self, rows: List[dict]) -> list:
+        client = _get_bigquery_client(self.project_id)
+        _ensure_table_exists(client, self.project_id)
+        
+        appender = self._get_appender()
+        if appender is not None:
+            try:
+                return appender.append(rows)
+            except Exception as e:
+                logger.warning(f"Storage Write append failed, retrying with insert_rows_json: {e}")
+        
+        # No insert IDs - skips per-row dedup bookkeeping for higher throughput;
+        # a rare duplicate telemetry row on retry is acceptable
+        return client.insert_rows_json(self.table_ref, rows, row_ids=[None] * len(rows))
+
+
+class LoadJobTelemetryBatcher(TelemetryBatcher):
+    """
+    Telemetry batcher that writes each batch with a BigQuery load job.
+    
+    Load jobs are free (streaming inserts are billed per byte) and cheap to
+    run at volume, but rows only land when a batch is flushed - minutes of
+    delay, which is fine for analytics. Load jobs are capped at 1,500 per
+    table per day across all instances, hence the long FLUSH_INTERVAL.
+    A batch whose load job fails is streamed instead, in BATCH_SIZE chunks.
+    Selected with TELEMETRY_MODE=load.
+    """
+    
+    BATCH_SIZE = 10000
+    FLUSH_INTERVAL = 300.0  # Seconds - 288 load jobs/day per instance
+    MAX_QUEUE_SIZE = 50000
+    STREAM_BATCH_SIZE = TelemetryBatcher.BATCH_SIZE
+    
+    def _insert(self, rows: List[dict]) -> list:
+        from google.cloud import bigquery  # Deferred to first use - slow to import
+        
+        client = _get_bigquery_client(self.project_id)
+        _ensure_table_exists(client, self.project_id)
+        
+        try:
+            ndjson = io.BytesIO(b"\n".join(orjson.dumps(row) for row in rows))
+            job = client.load_table_from_file(
+                ndjson,
+                self.table_ref,
+                job_config=bigquery.LoadJobConfig(
+                    source_format=bigquery.SourceFormat.NEWLINE_DELIMITED_JSON,
+                    write_disposition=bigquery.WriteDisposition.WRITE_APPEND,
+                ),
+            )
+            job.result()
+            return []
+        except Exception as e:
+            logger.warning(f"Telemetry load job failed, streaming {len(rows)} rows instead: {e}")
+        
+        errors = []
+        for start in range(0, len(rows), self.STREAM_BATCH_SIZE):
+            errors.extend(super()._insert(rows[start:start + self.STREAM_BATCH_SIZE]))
+        return errors
+
+
+_batcher: Optional[TelemetryBatcher] = None
+
+
+def get_telemetry_batcher(project_id: str) -> TelemetryBatcher:
+    """Get the process-wide telemetry batcher (its class set by TELEMETRY_MODE)."""
+    global _batcher
+    if _batcher is None:
+        if settings.TELEMETRY_MODE == "load":
+            _batcher = LoadJobTelemetryBatcher(project_id)
+        else:
+            _batcher = TelemetryBatcher(project_id)
+    return _batcher
+
+
+_USER_ANALYTICS_SQL = """
+SELECT
+    COUNT(*) as total_conversations,
+    COUNTIF(was_escalated) as escalation_count,
+    AVG(total_latency_ms) as avg_latency_ms,
+    APPROX_TOP_COUNT(topic, 3) as top_topics,
+    APPROX_TOP_COUNT(sentiment, 3) as sentiment_distribution,
+    MAX(timestamp) as last_interaction
+FROM `{table_ref}`
+WHERE user_id = @user_id
+  AND timestamp >= @since
+"""
+
+
+@lru_cache(maxsize=None)
+def _user_analytics_sql(project_id: str) -> str:
+    """Analytics query text for a project (only the table is substituted)."""
+    return _USER_ANALYTICS_SQL.format(table_ref=_table_ref(project_id))
+
+
 def get_user_analytics(
     project_id: str,
     user_id: str,
@@ -231,30 +542,23 @@ def get_user_analytics(
     Returns:
         dict with user analytics
     """
+    from google.cloud import bigquery  # Deferred to first use - slow to import
     try:
         client = _get_bigquery_client(project_id)
         
-        query = f"""
-        SELECT
-            COUNT(*) as total_conversations,
-            COUNTIF(was_escalated) as escalation_count,
-            AVG(total_latency_ms) as avg_latency_ms,
-            APPROX_TOP_COUNT(topic, 3) as top_topics,
-            APPROX_TOP_COUNT(sentiment, 3) as sentiment_distribution,
-            MAX(timestamp) as last_interaction
-        FROM `{project_id}.{DATASET_ID}.{TABLE_ID}`
-        WHERE user_id = @user_id
-          AND timestamp >= TIMESTAMP_SUB(CURRENT_TIMESTAMP(), INTERVAL @days DAY)
-        """
-        
+        # Window start computed here and truncated to the hour: CURRENT_TIMESTAMP()
+        # in the SQL would disable BigQuery's results cache, while identical
+        # parameters within the hour are served from it
+        since = datetime.now(_UTC).replace(minute=0, second=0, microsecond=0) - timedelta(days=days)
         job_config = bigquery.QueryJobConfig(
             query_parameters=[
                 bigquery.ScalarQueryParameter("user_id", "STRING", user_id),
-                bigquery.ScalarQueryParameter("days", "INT64", days),
-            ]
+                bigquery.ScalarQueryParameter("since", "TIMESTAMP", since),
+            ],
+            use_query_cache=True,
         )
         
-        results = client.query(query, job_config=job_config).result()
+        results = client.query(_user_analytics_sql(project_id), job_config=job_config).result()
         rows = [dict(row) for row in results]
         
         if rows:
@@ -0,0 +1,118 @@
+"""
+Redis Cache - Cache-aside hot cache for near-static backend lookups
+
+Customer profiles and tier limits rarely change within a session, so they are
+cached in Redis in front of the database calls. Guardrails classifications
+for queries repeated within a call are cached briefly to skip the LLM call.
+
+Redis is optional: if REDIS_URL is not set (or the redis package is not
+installed) every lookup is a miss and writes are dropped.
+"""
+
+import hashlib
+import logging
+from functools import lru_cache
+from typing import Any, Optional
+
+import orjson
+
+from app.config import settings
+
+try:
+    import redis.asyncio as redis
+except ImportError:
+    redis = None
+
+logger = logging.getLogger(__name__)
+
+# Datetimes go through default=str (same format as before the switch from
+# json), and int dict keys are stringified as json.dumps does
+_DUMPS_OPTIONS = orjson.OPT_PASSTHROUGH_DATETIME | orjson.OPT_NON_STR_KEYS
+
+
+def customer_cache_key(project_id: str, user_id: str) -> str:
+    """Build the cache key for a customer profile (v2: flat fetch_user payload)."""
+    return f"cust:v2:{project_id}:{user_id}"
+
+
+def limits_cache_key(project_id: str, tier_name: str) -> str:
+    """Build the cache key for a tier's limits."""
+    return f"limits:{project_id}:{tier_name}"
+
+
+def guardrails_cache_key(
+    query: str,
+    session_id: str,
+    customer_id: Optional[str] = None,
+    user_id: Optional[str] = None,
+    caller_name: Optional[str] = None
+) -> str:
+    """
+    Build the cache key for a guardrails classification.
+
+    The guardrails result carries identity fields (is_authenticated, user_id,
+    caller_name, ...) read from the session, so the key is scoped to the
+    session and every identity it may hold - a cached result must never be
+    served to a different caller. user_id is often still unset when guardrails
+    runs, which is why the session id and customer_id are part of the key.
+    """
+    raw = "\x1f".join((
+        query.lower().strip(), session_id, customer_id or "", user_id or "", caller_name or "",
+    ))
+    return "gr:" + hashlib.blake2b(raw.encode(), digest_size=16).hexdigest()
+
+
+class RedisCache:
+    """
+    Thin JSON (orjson) wrapper around an async Redis client.
+
+    All errors are logged and swallowed - the cache must never break
+    a request, it can only make it faster.
+    """
+
+    def __init__(self, url: str):
+        self._client = None
+        if url and redis is not None:
+            self._client = redis.from_url(url)
+            logger.info("Redis cache enabled")
+        elif url:
+            logger.warning("REDIS_URL is set but redis is not installed - cache disabled")
+
+    @property
+    def enabled(self) -> bool:
+        return self._client is not None
+
+    async def get(self, key: str) -> Optional[Any]:
+        """Get a cached value, or None on miss/error."""
+        if self._client is None:
+            return None
+        try:
+            raw = await self._client.get(key)
+            return orjson.loads(raw) if raw else None
+        except Exception as e:
+            logger.warning(f"Redis GET failed for {key}: {e}")
+            return None
+
+    async def setex(self, key: str, ttl: int, value: Any) -> None:
+        """Cache a JSON-serializable value with a TTL in seconds."""
+        if self._client is None:
+            return
+        try:
+            await self._client.setex(key, ttl, orjson.dumps(value, default=str, option=_DUMPS_OPTIONS))
+        except Exception as e:
+            logger.warning(f"Redis SETEX failed for {key}: {e}")
+
+    async def delete(self, *keys: str) -> None:
+        """Invalidate one or more keys."""
+        if self._client is None or not keys:
+            return
+        try:
+            await self._client.delete(*keys)
+        except Exception as e:
+            logger.warning(f"Redis DEL failed for {keys}: {e}")
+
+
+@lru_cache()
+def get_cache() -> RedisCache:
+    """Get cached Redis cache instance."""
+    return RedisCache(settings.REDIS_URL)
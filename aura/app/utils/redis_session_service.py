@@ -0,0 +1,190 @@
+"""
+Redis Session Service - ADK sessions shared by every instance
+
+Dialogflow CX can route the turns of one call to any Cloud Run instance, so
+session state can't live in process memory. Sessions are kept in Redis:
+
+    sess:{app}:{user}:{session_id}     hash - state (JSON) + last_update_time
+    sessev:{app}:{user}:{session_id}   list - one JSON event per append
+    sessidx:{app}:{user}               set  - session ids, for list_sessions
+
+Every write refreshes a sliding TTL, so abandoned calls expire on their own.
+State dicts are serialized with orjson; events go through pydantic's JSON
+serializer, which round-trips their bytes fields (base64) correctly.
+
+Scoped state (app:/user: keys) is stored per session, not shared across
+sessions as the in-memory service does - this app doesn't use it.
+"""
+
+import logging
+import time
+import uuid
+from typing import Any, Dict, Optional
+
+import orjson
+import redis.asyncio as redis
+from google.adk.events import Event
+from google.adk.sessions import BaseSessionService, Session
+from google.adk.sessions.base_session_service import GetSessionConfig, ListSessionsResponse
+
+logger = logging.getLogger(__name__)
+
+
+def _session_key(app_name: str, user_id: str, session_id: str) -> str:
+    return f"sess:{app_name}:{user_id}:{session_id}"
+
+
+def _events_key(app_name: str, user_id: str, session_id: str) -> str:
+    return f"sessev:{app_name}:{user_id}:{session_id}"
+
+
+def _index_key(app_name: str, user_id: str) -> str:
+    return f"sessidx:{app_name}:{user_id}"
+
+
+class RedisSessionService(BaseSessionService):
+    """ADK session service backed by a pooled async Redis client."""
+
+    def __init__(self, url: str, ttl: int):
+        self._client = redis.from_url(url, decode_responses=False)
+        self._ttl = ttl
+        logger.info("Redis session service enabled")
+
+    async def create_session(
+        self,
+        *,
+        app_name: str,
+        user_id: str,
+        state: Optional[Dict[str, Any]] = None,
+        session_id: Optional[str] = None,
+    ) -> Session:
+        session_id = (session_id or "").strip() or str(uuid.uuid4())
+        session = Session(
+            id=session_id,
+            app_name=app_name,
+            user_id=user_id,
+            state=dict(state or {}),
+            last_update_time=time.time(),
+        )
+
+        key = _session_key(app_name, user_id, session_id)
+        index_key = _index_key(app_name, user_id)
+        async with self._client.pipeline(transaction=True) as pipe:
+            pipe.hset(key, mapping={
+                "state": orjson.dumps(session.state, default=str),
+                "last_update_time": repr(session.last_update_time),
+            })
+            pipe.expire(key, self._ttl)
+            pipe.sadd(index_key, session_id)
+            pipe.expire(index_key, self._ttl)
+            await pipe.execute()
+        return session
+
+    async def get_session(
+        self,
+        *,
+        app_name: str,
+        user_id: str,
+        session_id: str,
+        config: Optional[GetSessionConfig] = None,
+    ) -> Optional[Session]:
+        # Only fetch the events that will be returned
+        start = 0
+        if config and config.num_recent_events:
+            start = -config.num_recent_events
+
+        # One round trip for the session hash and its events
+        async with self._client.pipeline(transaction=False) as pipe:
+            pipe.hgetall(_session_key(app_name, user_id, session_id))
+            pipe.lrange(_events_key(app_name, user_id, session_id), start, -1)
+            fields, raw_events = await pipe.execute()
+        if not fields:
+            return None
+
+        events = [Event.model_validate_json(raw) for raw in raw_events]
+        if config and config.after_timestamp:
+            events = [event for event in events if event.timestamp >= config.after_timestamp]
+
+        return Session(
+            id=session_id,
+            app_name=app_name,
+            user_id=user_id,
+            state=orjson.loads(fields[b"state"]),
+            events=events,
+            last_update_time=float(fields[b"last_update_time"]),
+        )
+
+    async def list_sessions(
+        self,
+        *,
+        app_name: str,
+        user_id: Optional[str] = None,
+    ) -> ListSessionsResponse:
+        """List sessions (without events or state) for a user, or all users."""
+        if user_id is not None:
+            users = [user_id]
+        else:
+            prefix = _index_key(app_name, "")
+            users = [
+                key.decode()[len(prefix):]
+                async for key in self._client.scan_iter(match=f"{prefix}*")
+            ]
+
+        sessions = []
+        for user in users:
+            session_ids = [sid.decode() for sid in await self._client.smembers(_index_key(app_name, user))]
+            if not session_ids:
+                continue
+            async with self._client.pipeline(transaction=False) as pipe:
+                for session_id in session_ids:
+                    pipe.hget(_session_key(app_name, user, session_id), "last_update_time")
+                update_times = await pipe.execute()
+            # Index entries can outlive their expired sessions - skip those
+            sessions.extend(
+                Session(id=session_id, app_name=app_name, user_id=user, last_update_time=float(ts))
+                for session_id, ts in zip(session_ids, update_times)
+                if ts is not None
+            )
+        return ListSessionsResponse(sessions=sessions)
+
+    async def delete_session(
+        self,
+        *,
+        app_name: str,
+        user_id: str,
+        session_id: str,
+    ) -> None:
+        async with self._client.pipeline(transaction=True) as pipe:
+            pipe.delete(
+                _session_key(app_name, user_id, session_id),
+                _events_key(app_name, user_id, session_id),
+            )
+            pipe.srem(_index_key(app_name, user_id), session_id)
+            await pipe.execute()
+
+    async def append_event(self, session: Session, event: Event) -> Event:
+        """Apply the event to the session (base class), then persist it."""
+        if event.partial:
+            return event
+        event = await super().append_event(session=session, event=event)
+        session.last_update_time = event.timestamp
+
+        key = _session_key(session.app_name, session.user_id, session.id)
+        events_key = _events_key(session.app_name, session.user_id, session.id)
+        index_key = _index_key(session.app_name, session.user_id)
+        fields = {"last_update_time": repr(event.timestamp)}
+        if event.actions and event.actions.state_delta:
+            fields["state"] = orjson.dumps(session.state, default=str)
+
+        async with self._client.pipeline(transaction=True) as pipe:
+            pipe.rpush(events_key, event.model_dump_json(exclude_none=True))
+            pipe.hset(key, mapping=fields)
+            pipe.expire(key, self._ttl)
+            pipe.expire(events_key, self._ttl)
+            pipe.expire(index_key, self._ttl)
+            await pipe.execute()
+        return event
+
+    async def close(self) -> None:
+        """Close the connection pool."""
+        await self._client.aclose()
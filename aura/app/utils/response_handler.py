@@ -4,9 +4,10 @@ Response Handler - Clean abstraction for yielding Events and managing responses
 This eliminates hard-coded messages and provides a single point for Event handling.
 """
 
-import json
 import logging
 from typing import Optional, Dict, Any
+
+import orjson
 from google.adk.events import Event
 from google.genai import types
 
@@ -68,10 +69,10 @@ class ResponseHandler:
 
         This is separate from Event creation for clarity.
         """
-        return json.dumps({
+        return orjson.dumps({
             "decision": decision,
             "speech_text": speech_text,
             "should_escalate": should_escalate,
             "escalation_reason": escalation_reason,
             "follow_up_prompt": follow_up_prompt,
-        })
\ No newline at end of file
+        }).decode()
\ No newline at end of file
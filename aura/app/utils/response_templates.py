@@ -8,22 +8,29 @@ Makes it easy to:
 - Maintain consistent tone
 """
 
-from typing import Dict, List, Optional
-from dataclasses import dataclass
-import random
+from typing import Dict, Iterator, List, Optional
+from dataclasses import dataclass, field
+from types import MappingProxyType
+import itertools
 
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class ResponseTemplate:
-    """Single response template with variations."""
+    """Single response template with variations (read-only, shared across requests)."""
     messages: List[str]  # Multiple variations for natural feel
     follow_up: Optional[str] = None
     tone: str = "neutral"
+    # Round-robin over the variations - varied enough, without an RNG call per turn
+    _variations: Iterator[str] = field(init=False, repr=False, compare=False)
+
+    def __post_init__(self):
+        # frozen - set the derived field directly
+        object.__setattr__(self, "_variations", itertools.cycle(self.messages))
 
     def get_message(self, use_variation: bool = True) -> str:
         """Get a message, optionally rotating through variations."""
         if use_variation and len(self.messages) > 1:
-            return random.choice(self.messages)
+            return next(self._variations)
         return self.messages[0]
 
 
@@ -31,13 +38,18 @@ class ResponseTemplates:
     """
     Central repository for all response templates.
 
+    The template tables are read-only (MappingProxyType, frozen templates)
+    and lookups are flat dict lookups built at import - they return the shared
+    template object, and variation is picked per call via
+    ResponseTemplate.get_message().
+
     TODO: Move to YAML/JSON config file or database for production
     """
 
     # ============================================================
     # BLOCKED RESPONSES
     # ============================================================
-    BLOCKED = {
+    BLOCKED = MappingProxyType({
         "out_of_scope": ResponseTemplate(
             messages=[
                 "I'm your assistant, so I can help with questions about your account, services, and support. Is there something I can help with?",
@@ -58,7 +70,7 @@ class ResponseTemplates:
             ],
             tone="polite"
         )
-    }
+    })
 
     # ============================================================
     # GREETING RESPONSES
@@ -89,7 +101,7 @@ class ResponseTemplates:
     # ============================================================
     # ESCALATION RESPONSES
     # ============================================================
-    ESCALATION = {
+    ESCALATION = MappingProxyType({
         "urgent_legal": ResponseTemplate(
             messages=[
                 "I understand this is an important matter. Let me connect you with a senior member of our team who can properly address your concerns and ensure they're handled with the attention they deserve. Please hold for just a moment.",
@@ -109,29 +121,41 @@ class ResponseTemplates:
             ],
             tone="professional"
         )
-    }
+    })
 
-    @classmethod
-    def get_blocked_message(cls, category: str) -> ResponseTemplate:
+    @staticmethod
+    def get_blocked_message(category: str) -> ResponseTemplate:
         """Get blocked response template for a category."""
-        return cls.BLOCKED.get(category, cls.BLOCKED["default"])
+        return _BLOCKED_LOOKUP.get(category, _DEFAULT_BLOCKED)
 
-    @classmethod
-    def get_greeting_message(cls, category: str) -> ResponseTemplate:
+    @staticmethod
+    def get_greeting_message(category: str) -> ResponseTemplate:
         """Get greeting/thanks/goodbye response."""
-        if category == "greeting":
-            return cls.GREETING
-        elif category == "thanks":
-            return cls.THANKS
-        elif category == "goodbye":
-            return cls.GOODBYE
-        return cls.GREETING
-
-    @classmethod
-    def get_escalation_message(cls, category: str, sentiment: str) -> ResponseTemplate:
-        """Get escalation response based on category and sentiment."""
-        if category == "urgent_legal":
-            return cls.ESCALATION["urgent_legal"]
-        elif sentiment == "frustrated":
-            return cls.ESCALATION["frustrated"]
-        return cls.ESCALATION["default"]
\ No newline at end of file
+        return _GREETING_LOOKUP.get(category, ResponseTemplates.GREETING)
+
+    @staticmethod
+    def get_escalation_message(category: str, sentiment: str) -> ResponseTemplate:
+        """Get escalation response based on category and sentiment (category wins)."""
+        return (
+            _ESCALATION_BY_CATEGORY.get(category)
+            or _ESCALATION_BY_SENTIMENT.get(sentiment, _DEFAULT_ESCALATION)
+        )
+
+
+# Flat lookup tables, built once at import
+_BLOCKED_LOOKUP = ResponseTemplates.BLOCKED
+_DEFAULT_BLOCKED = ResponseTemplates.BLOCKED["default"]
+
+_GREETING_LOOKUP = MappingProxyType({
+    "greeting": ResponseTemplates.GREETING,
+    "thanks": ResponseTemplates.THANKS,
+    "goodbye": ResponseTemplates.GOODBYE,
+})
+
+_ESCALATION_BY_CATEGORY = MappingProxyType({
+    "urgent_legal": ResponseTemplates.ESCALATION["urgent_legal"],
+})
+_ESCALATION_BY_SENTIMENT = MappingProxyType({
+    "frustrated": ResponseTemplates.ESCALATION["frustrated"],
+})
+_DEFAULT_ESCALATION = ResponseTemplates.ESCALATION["default"]
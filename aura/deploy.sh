@@ -33,6 +33,15 @@ gcloud services enable \
     discoveryengine.googleapis.com \
     --project=${PROJECT_ID}
 
+# Conversation history records expire via a Firestore TTL policy on expire_at
+echo "🗑️  Enabling Firestore TTL on conversation interactions..."
+gcloud firestore fields ttls update expire_at \
+    --collection-group=interactions \
+    --enable-ttl \
+    --async \
+    --project=${PROJECT_ID} \
+    || echo "⚠️  Could not update the TTL policy - check it in the Firestore console"
+
 # Step 2: Build and push Docker image
 echo ""
 echo "🐳 Step 2: Building Docker image..."
@@ -3,15 +3,16 @@ Webhook Server for Dialogflow CX
 """
 
 import os
-import json
 import logging
 import asyncio
-from typing import Optional
+from typing import Optional, Tuple
 from contextlib import asynccontextmanager
+from functools import lru_cache
 
 from fastapi import FastAPI, Request, HTTPException
-from fastapi.responses import JSONResponse
+from fastapi.responses import ORJSONResponse
 from google.genai import types
+import orjson
 import uvicorn
 
 # Load environment variables BEFORE importing ADK
@@ -29,8 +30,14 @@ os.environ["GOOGLE_GENAI_USE_VERTEXAI"] = "TRUE"
 
 # Now import ADK
 from google.adk.runners import Runner
-from google.adk.sessions import InMemorySessionService
-from app.agents.agent import root_agent
+from google.adk.sessions import BaseSessionService, InMemorySessionService
+from app.agents.agent import get_root_agent
+from app.agents.customer_context_agent import preload_customer_context
+from app.config import settings
+from app.tools.telemetry import ensure_telemetry_table, get_telemetry_batcher
+from app.tools.conversation_memory import warm_clients as warm_history_clients
+from app.tools.fetch_customer import warm_clients as warm_user_clients
+from app.tools.fetch_limits import warm_client as warm_limits_client
 
 # Configure logging
 logging.basicConfig(
@@ -41,7 +48,25 @@ logger = logging.getLogger(__name__)
 
 # Global runner and session service
 runner: Optional[Runner] = None
-session_service: Optional[InMemorySessionService] = None
+session_service: Optional[BaseSessionService] = None
+
+
+def _create_session_service() -> BaseSessionService:
+    """Redis-backed sessions when REDIS_URL is set (shared by all instances), else in-memory."""
+    if settings.REDIS_URL:
+        try:
+            from app.utils.redis_session_service import RedisSessionService
+            return RedisSessionService(settings.REDIS_URL, ttl=settings.SESSION_TTL)
+        except ImportError as e:
+            logger.warning(f"Redis session service unavailable - using in-memory sessions: {e}")
+    return InMemorySessionService()
+
+
+@lru_cache(maxsize=2048)
+def _derive_ids(session_id: str) -> Tuple[str, str]:
+    """Map a Dialogflow session path to (ADK session id, ADK user id) - stable across turns."""
+    clean_session_id = session_id.rpartition("/")[2]
+    return clean_session_id, f"dfcx-{clean_session_id[:20]}"
 
 
 @asynccontextmanager
@@ -51,17 +76,39 @@ async def lifespan(app: FastAPI):
     
     logger.info("Initializing ADK Agent...")
     
-    session_service = InMemorySessionService()
+    session_service = _create_session_service()
     runner = Runner(
-        agent=root_agent,
+        agent=get_root_agent(),
         app_name="policyvoice",
         session_service=session_service,
     )
     
+    # Open backend connections (and create the telemetry table) now
+    # instead of on the first caller's turn
+    warmups = await asyncio.gather(
+        warm_history_clients(settings.GCP_PROJECT_ID),
+        warm_user_clients(settings.GCP_PROJECT_ID),
+        asyncio.to_thread(warm_limits_client, settings.GCP_PROJECT_ID),
+        asyncio.to_thread(ensure_telemetry_table, settings.GCP_PROJECT_ID),
+        return_exceptions=True,
+    )
+    for result in warmups:
+        if isinstance(result, Exception):
+            logger.warning(f"Backend client warmup failed: {result}")
+    
+    # Batch telemetry inserts in the background
+    telemetry_batcher = get_telemetry_batcher(settings.GCP_PROJECT_ID)
+    telemetry_batcher.start()
+    
     logger.info("ADK Agent ready to receive requests!")
     yield
     
     logger.info("Shutting down ADK Agent...")
+    # Let in-flight conversation saves and telemetry finish while the batcher still runs
+    await get_root_agent().drain_pending_writes()
+    await telemetry_batcher.stop()
+    if hasattr(session_service, "close"):
+        await session_service.close()
 
 
 app = FastAPI(
@@ -78,58 +125,96 @@ async def health_check():
     return {"status": "healthy", "agent": "policyvoice"}
 
 
+@app.post("/warm")
+async def warm(request: Request):
+    """
+    Warm-up endpoint - pre-builds the agent tree.
+    
+    Optionally send JSON with {"user_id": "..."} to also preload that
+    customer's profile and tier limits into the hot cache.
+    """
+    get_root_agent().warm()
+    
+    raw_body = await request.body()
+    body = orjson.loads(raw_body) if raw_body else {}
+    user_id = body.get("user_id")
+    
+    customer_preloaded = False
+    if user_id:
+        customer_preloaded = await preload_customer_context(user_id)
+    
+    return {"status": "warm", "customer_preloaded": customer_preloaded}
+
+
 @app.post("/webhook")
 async def dialogflow_webhook(request: Request):
     """Handle Dialogflow CX webhook requests."""
+    return await _process_webhook(await request.body())
+
+
+async def _process_webhook(raw_body: bytes) -> ORJSONResponse:
+    """Run one Dialogflow CX webhook turn from the raw request body."""
     global runner, session_service
     
     try:
-        body = await request.json()
-        logger.info(f"Received webhook request: {json.dumps(body, indent=2)[:500]}...")
+        body = orjson.loads(raw_body)
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("Received webhook request: %s...", orjson.dumps(body)[:500])
         
         # Extract session info
         session_info = body.get("sessionInfo", {})
         session_id = session_info.get("session", "unknown-session")
         parameters = session_info.get("parameters", {})
         
-        # Extract user query
-        user_query = (
-            body.get("text") or 
-            body.get("transcript") or
-            body.get("fulfillmentInfo", {}).get("tag") or
-            ""
-        )
-        
-        if not user_query and body.get("intentInfo"):
-            messages = body.get("messages", [])
-            for msg in reversed(messages):
-                if msg.get("source") == "VIRTUAL_AGENT":
-                    continue
-                user_query = msg.get("text", {}).get("text", [""])[0]
-                if user_query:
-                    break
-        
-        if not user_query:
-            logger.warning("No user query found in request")
-            return _build_response("I didn't catch that. Could you please repeat?", session_id, parameters)
-        
-        logger.info(f"Processing query: {user_query[:100]}...")
-        
-        # Extract customer identifiers
-        customer_id = parameters.get("customer_id", "")
-        policy_number = parameters.get("policy_number", "")
-        caller_name = parameters.get("caller_name", "")
-        
         # Clean session ID for ADK
-        clean_session_id = session_id.split("/")[-1] if "/" in session_id else session_id
-        user_id = f"dfcx-{clean_session_id[:20]}"
+        clean_session_id, user_id = _derive_ids(session_id)
         
-        # Get or create ADK session
-        session = await session_service.get_session(
+        # Start the session lookup now - it runs while the query and
+        # parameters are extracted
+        session_task = asyncio.create_task(session_service.get_session(
             app_name="policyvoice",
             user_id=user_id,
             session_id=clean_session_id
-        )
+        ))
+            
+        try:
+            # Extract user query
+            user_query = (
+                body.get("text") or 
+                body.get("transcript") or
+                body.get("fulfillmentInfo", {}).get("tag") or
+                ""
+            )
+            
+            if not user_query and body.get("intentInfo"):
+                messages = body.get("messages", [])
+                for msg in reversed(messages):
+                    if msg.get("source") == "VIRTUAL_AGENT":
+                        continue
+                    user_query = msg.get("text", {}).get("text", [""])[0]
+                    if user_query:
+                        break
+            
+            if not user_query:
+                logger.warning("No user query found in request")
+                return _build_response("I didn't catch that. Could you please repeat?", session_id, parameters)
+            
+            logger.info(f"Processing query: {user_query[:100]}...")
+            
+            # Extract customer identifiers
+            customer_id = parameters.get("customer_id", "")
+            policy_number = parameters.get("policy_number", "")
+            caller_name = parameters.get("caller_name", "")
+            
+            # Get or create ADK session
+            session = await session_task
+        finally:
+            # Don't leave the lookup running (or its error unretrieved) when
+            # extraction fails or the turn ends early
+            if not session_task.done():
+                session_task.cancel()
+            elif not session_task.cancelled():
+                session_task.exception()
         
         if session is None:
             session = await session_service.create_session(
@@ -147,10 +232,15 @@ async def dialogflow_webhook(request: Request):
         else:
             logger.info(f"Retrieved existing session: {clean_session_id}")
         
-        # Update session state with latest parameters
-        session.state["customer_id"] = customer_id or session.state.get("customer_id", "")
-        session.state["policy_number"] = policy_number or session.state.get("policy_number", "")
-        session.state["caller_name"] = caller_name or session.state.get("caller_name", "")
+        # Update session state with latest parameters - only the ones that changed
+        state = session.state
+        for key, value in (
+            ("customer_id", customer_id),
+            ("policy_number", policy_number),
+            ("caller_name", caller_name),
+        ):
+            if value and state.get(key) != value:
+                state[key] = value
         
         # Run the ADK agent
         response_text = ""
@@ -164,28 +254,32 @@ async def dialogflow_webhook(request: Request):
             session_id=clean_session_id,
             new_message=user_content
         ):
-            if hasattr(event, 'content') and event.content:
-                if hasattr(event.content, 'parts'):
-                    for part in event.content.parts:
-                        if hasattr(part, 'text') and part.text:
-                            response_text = part.text
+            # ADK Events always carry these attributes - only the values can be None
+            content = event.content
+            parts = content.parts if content else None
+            if parts:
+                # Last part with text wins
+                for part in reversed(parts):
+                    if part.text:
+                        response_text = part.text
+                        break
             
-            if hasattr(event, 'actions') and event.actions:
-                state_delta = getattr(event.actions, 'state_delta', {})
-                if 'final_response' in state_delta:
-                    try:
-                        final = json.loads(state_delta['final_response'])
-                        response_text = final.get('speech_text', response_text)
-                        should_escalate = final.get('should_escalate', False)
-                    except:
-                        pass
+            actions = event.actions
+            state_delta = actions.state_delta if actions else None
+            if state_delta and 'final_response' in state_delta:
+                try:
+                    final = orjson.loads(state_delta['final_response'])
+                    response_text = final.get('speech_text', response_text)
+                    should_escalate = final.get('should_escalate', False)
+                except:
+                    pass
         
         # Get final response from session state if not captured
         if not response_text:
             final_response = session.state.get("final_response", "")
             if final_response:
                 try:
-                    final = json.loads(final_response)
+                    final = orjson.loads(final_response)
                     response_text = final.get('speech_text', '')
                     should_escalate = final.get('should_escalate', False)
                 except:
@@ -194,7 +288,7 @@ async def dialogflow_webhook(request: Request):
         if not response_text:
             response_text = "I'm sorry, I couldn't process that request. Would you like to speak with an agent?"
         
-        logger.info(f"Response: {response_text[:100]}...")
+        logger.debug("Response: %.100s...", response_text)
         
         return _build_response(
             text=response_text,
@@ -218,7 +312,7 @@ def _build_response(
     session_id: str,
     parameters: dict,
     should_escalate: bool = False
-) -> JSONResponse:
+) -> ORJSONResponse:
     """Build Dialogflow CX webhook response."""
     response = {
         "fulfillmentResponse": {
@@ -234,7 +328,7 @@ def _build_response(
         response["sessionInfo"]["parameters"]["escalate_to_agent"] = True
         response["targetPage"] = "projects/-/locations/-/agents/-/flows/-/pages/LIVE_AGENT_HANDOFF"
     
-    return JSONResponse(content=response)
+    return ORJSONResponse(content=response)
 
 
 @app.post("/")
@@ -247,18 +341,14 @@ async def root_webhook(request: Request):
 @app.post("/test")
 async def test_query(request: Request):
     """Test endpoint - send JSON with {"text": "your question"}"""
-    body = await request.json()
-    test_request = Request(scope=request.scope)
-    test_request._json = {
+    body = orjson.loads(await request.body())
+    return await _process_webhook(orjson.dumps({
         "text": body.get("text", "Hello"),
         "sessionInfo": {
             "session": "test-session-123",
             "parameters": body.get("parameters", {})
         }
-    }
-    # Manually set the json
-    request._json = test_request._json
-    return await dialogflow_webhook(request)
+    }))
 
 
 if __name__ == "__main__":